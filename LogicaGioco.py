@@ -1,49 +1,205 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable
 import json
 import os
+import threading
+import struct
+import time
+import weakref
+import zlib
+from collections import deque
 from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from eventi import BusEventi, GiocatoriCambiati, bus_eventi
 
 # ==========================================
 # 1. INTERFACCE OBSERVER
 # ==========================================
 
 class Observer(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def update(self, subject: "Subject") -> None:
         pass
 
+class Cambiamento:
+    """Un campo del soggetto che è cambiato, con il valore prima e dopo"""
+    __slots__ = ("campo", "vecchio", "nuovo")
+
+    def __init__(self, campo: str, vecchio: Any = None, nuovo: Any = None):
+        self.campo = campo
+        self.vecchio = vecchio
+        self.nuovo = nuovo
+
+    def __eq__(self, altro):
+        return isinstance(altro, Cambiamento) and (altro.campo, altro.vecchio, altro.nuovo) == (self.campo, self.vecchio, self.nuovo)
+
+    def __repr__(self):
+        return f"Cambiamento({self.campo}: {self.vecchio!r} -> {self.nuovo!r})"
+
 class Subject(ABC):
-    def __init__(self):
-        self._observers: List[Observer] = []
+    """
+    Gli osservatori sono tenuti con riferimenti deboli (un widget scartato sparisce da solo),
+    vengono chiamati in ordine di priorità (più alta prima, a parità in ordine di attach) e
+    possono chiedere solo alcuni campi. Dentro `with soggetto.batch():` le modifiche si
+    accumulano e arriva una sola notifica all'uscita; durante update() i campi cambiati
+    sono in `soggetto.cambiamenti`. Se il soggetto ha un bus, le stesse modifiche vengono
+    anche pubblicate come eventi (consegnati dal loop principale una volta per frame).
+    Dizionari e liste vengono creati solo al primo attach/batch: un soggetto mai osservato
+    (es. i giocatori delle simulazioni) costa solo i suoi slot.
+    """
+    __slots__ = ("_observers", "_ordine", "_progressivo", "_batch", "_in_sospeso", "cambiamenti", "bus", "__weakref__")
 
-    def attach(self, observer: Observer) -> None:
-        if observer not in self._observers:
-            self._observers.append(observer)
+    def __init__(self):
+        # id(observer) -> (priorita, progressivo, riferimento debole, campi)
+        self._observers: Dict[int, tuple] | None = None
+        self._ordine: List[tuple] | None = None
+        self._progressivo = 0
+        self._batch = 0
+        self._in_sospeso: Dict[str, Cambiamento] | None = None
+        self.cambiamenti: tuple = ()
+        self.bus: BusEventi | None = None
+
+    def attach(self, observer: Observer, priorita: int = 0, campi=None) -> None:
+        chiave = id(observer)
+        if self._observers is None: self._observers = {}
+        if chiave in self._observers: return
+        rif_soggetto = weakref.ref(self)
+        def rimuovi(_):
+            # L'observer è stato raccolto: esce dalla lista senza bisogno di detach()
+            soggetto = rif_soggetto()
+            if soggetto is not None and soggetto._observers.pop(chiave, None) is not None:
+                soggetto._ordine = None
+        self._progressivo += 1
+        campi = frozenset(campi) if campi is not None else None
+        self._observers[chiave] = (priorita, self._progressivo, weakref.ref(observer, rimuovi), campi)
+        self._ordine = None
 
     def detach(self, observer: Observer) -> None:
-        if observer in self._observers:
-            self._observers.remove(observer)
-
-    def notify(self) -> None:
-        for observer in self._observers:
-            observer.update(self)
+        if self._observers and self._observers.pop(id(observer), None) is not None:
+            self._ordine = None
+
+    def osservatori(self) -> List[Observer]:
+        return [o for _, _, o, _ in self._in_ordine()]
+
+    def _in_ordine(self) -> List[tuple]:
+        if not self._observers: return []
+        if self._ordine is None: # Ricalcolato solo dopo attach/detach
+            self._ordine = sorted(self._observers.values(), key=lambda v: (-v[0], v[1]))
+        vivi = []
+        for priorita, n, ref, campi in self._ordine:
+            observer = ref()
+            if observer is not None: vivi.append((priorita, n, observer, campi))
+        return vivi
+
+    @contextmanager
+    def batch(self):
+        """Accorpa tutte le modifiche del blocco in una sola notifica (i blocchi si possono annidare)"""
+        self._batch += 1
+        try:
+            yield self
+        finally:
+            self._batch -= 1
+            if not self._batch and self._in_sospeso:
+                cambiamenti = [c for c in self._in_sospeso.values() if c.vecchio != c.nuovo or c.vecchio is None]
+                self._in_sospeso = None
+                if cambiamenti: self._notifica(tuple(cambiamenti))
+
+    def notify(self, *cambiamenti: Cambiamento) -> None:
+        if not cambiamenti: cambiamenti = (Cambiamento("*"),) # Modifica generica: interessa a tutti
+        if not self._batch:
+            self._notifica(cambiamenti)
+            return
+        if self._in_sospeso is None: self._in_sospeso = {}
+        for c in cambiamenti: # Per ogni campo restano il primo valore vecchio e l'ultimo nuovo
+            precedente = self._in_sospeso.get(c.campo)
+            self._in_sospeso[c.campo] = Cambiamento(c.campo, precedente.vecchio, c.nuovo) if precedente else c
+
+    def _notifica(self, cambiamenti: tuple) -> None:
+        if not self._observers and self.bus is None: return
+        nomi = {c.campo for c in cambiamenti}
+        generico = "*" in nomi
+        precedenti, self.cambiamenti = self.cambiamenti, cambiamenti
+        try:
+            for _, _, observer, campi in self._in_ordine():
+                if campi is None or generico or not campi.isdisjoint(nomi):
+                    observer.update(self)
+        finally:
+            self.cambiamenti = precedenti
+        if self.bus is not None: self.bus.pubblica_cambiamenti(self, cambiamenti)
 
 # ==========================================
 # 2. INVENTORY + ITERATOR (Spostato in alto per Player)
 # ==========================================
 
 class Item:
-    def __init__(self, nome: str, tipo: str, valore: int):
+    __slots__ = ("nome", "tipo", "valore", "id", "effetto")
+
+    def __init__(self, nome: str, tipo: str, valore: int, id: int | None = None, effetto: str | None = None):
         self.nome = nome
         self.tipo = tipo  # "Cura", "Attacco", "Utility"
         self.valore = valore
+        self.id = id            # Id nel catalogo (None per gli oggetti creati al volo)
+        self.effetto = effetto or ("cura" if tipo == "Cura" else None)
 
     def __repr__(self):
         return f"{self.nome}"
 
+# ---------- CATALOGO DEGLI OGGETTI ----------
+# Ogni oggetto del gioco è definito una volta sola: inventari e salvataggi lo indicano con il suo id.
+
+EFFETTI_OGGETTI: Dict[str, Callable[[Any, Item], None]] = {
+    "cura": lambda player, item: player.heal(item.valore),
+}
+
+TABELLA_OGGETTI = [
+    {"id": 1, "nome": "Spada", "tipo": "Attacco", "valore": 20},
+    {"id": 2, "nome": "Pozione", "tipo": "Cura", "valore": 20, "effetto": "cura"},
+]
+
+class CatalogoOggetti:
+    """Definizioni condivise (un solo Item per id), cercabili per id o per nome"""
+    def __init__(self, righe: List[Dict[str, Any]] | None = None):
+        self._per_id: Dict[int, Item] = {}
+        self._per_nome: Dict[str, Item] = {}
+        for riga in righe or []:
+            self.registra(Item(**riga))
+
+    def registra(self, item: Item) -> Item:
+        if item.id is None or item.id <= 0: raise ValueError(f"Id non valido per {item.nome}: {item.id}")
+        self._per_id[item.id] = item
+        self._per_nome[item.nome.lower()] = item
+        return item
+
+    def get(self, id: int) -> Item:
+        return self._per_id[id]
+
+    def per_nome(self, nome: str) -> Item | None:
+        return self._per_nome.get(nome.lower())
+
+    def da_salvataggio(self, voce: int | str | Dict[str, Any]) -> Item:
+        """
+        Un id del catalogo, o la definizione completa di un oggetto fuori catalogo;
+        i salvataggi vecchi hanno il nome (gli sconosciuti diventano Utility)
+        """
+        if isinstance(voce, int): return self._per_id[voce]
+        if isinstance(voce, dict): return Item(**voce)
+        return self.per_nome(voce) or Item(voce, "Utility", 20)
+
+    @staticmethod
+    def per_salvataggio(item: Item) -> int | Dict[str, Any]:
+        if item.id is not None: return item.id
+        voce = {"nome": item.nome, "tipo": item.tipo, "valore": item.valore}
+        if item.effetto is not None: voce["effetto"] = item.effetto
+        return voce
+
+catalogo_oggetti = CatalogoOggetti(TABELLA_OGGETTI)
+
 class InventoryIterator(Iterator):
+    __slots__ = ("_items", "_index")
+
     def __init__(self, items: List[Item]):
         self._items = items
         self._index = 0
@@ -57,11 +213,91 @@ class InventoryIterator(Iterator):
             raise StopIteration()
 
 class Inventory(Iterable):
-    def __init__(self):
-        self._items: List[Item] = []
+    """
+    Gli oggetti con lo stesso nome formano una pila (oggetto + quantità); un indice per categoria
+    tiene l'elenco delle pile di Attacco/Cura/Utility. Ogni modifica incrementa `versione`, così
+    chi disegna l'inventario può accorgersi che non è cambiato nulla senza scorrerlo.
+    """
+    __slots__ = ("_items", "_pile", "_categorie", "_viste", "_istantanea", "versione")
 
-    def add_item(self, item: Item):
-        self._items.append(item)
+    def __init__(self):
+        self._items: List[Item] = []                      # Un elemento per unità, in ordine di arrivo (iterazione e salvataggi)
+        self._pile: Dict[str, List[Any]] = {}             # nome -> [item, quantità]
+        self._categorie: Dict[str, Dict[str, None]] = {}  # "attacco" -> nomi delle pile (insieme ordinato)
+        self._viste: Dict[str, tuple] | None = None       # Pile per categoria già calcolate, valide fino alla prossima modifica
+        self._istantanea: tuple | None = None             # (versione, voci di salvataggio) dell'ultima istantanea
+        self.versione = 0
+
+    def _modificato(self):
+        self.versione += 1
+        self._viste = None
+        self._istantanea = None
+
+    def istantanea(self) -> tuple:
+        """Le voci di salvataggio (id del catalogo o definizioni): la stessa tupla finché l'inventario non cambia"""
+        # Anche il thread dell'autosave la costruisce: la cache porta la versione da cui è stata letta,
+        # così una tupla costruita mentre il gioco modificava l'inventario non viene mai riusata
+        versione, cache = self.versione, self._istantanea
+        if cache is not None and cache[0] == versione: return cache[1]
+        voci = tuple(CatalogoOggetti.per_salvataggio(item) for item in self._items)
+        self._istantanea = (versione, voci)
+        return voci
+
+    def add_item(self, item: Item, quantita: int = 1):
+        pila = self._pile.get(item.nome)
+        if pila is None:
+            pila = self._pile[item.nome] = [item, 0]
+            self._categorie.setdefault(item.tipo.lower(), {})[item.nome] = None
+        pila[1] += quantita
+        self._items.extend([pila[0]] * quantita)
+        self._modificato()
+
+    def remove_item(self, nome: str, quantita: int = 1) -> bool:
+        pila = self._pile.get(nome)
+        if pila is None or pila[1] < quantita: return False
+        pila[1] -= quantita
+        da_togliere = quantita
+        for i in range(len(self._items) - 1, -1, -1): # Si tolgono le unità arrivate per ultime
+            if self._items[i].nome == nome:
+                del self._items[i]
+                da_togliere -= 1
+                if not da_togliere: break
+        if pila[1] == 0:
+            del self._pile[nome]
+            del self._categorie[pila[0].tipo.lower()][nome]
+        self._modificato()
+        return True
+
+    def usa(self, nome: str) -> Item | None:
+        """Consuma un'unità dell'oggetto e la restituisce (None se non c'è)"""
+        pila = self._pile.get(nome)
+        if pila is None: return None
+        item = pila[0]
+        self.remove_item(nome)
+        return item
+
+    def quantita(self, nome: str) -> int:
+        pila = self._pile.get(nome)
+        return pila[1] if pila else 0
+
+    def conteggi(self) -> Dict[str, int]:
+        """nome -> quantità, in ordine di arrivo"""
+        return {nome: pila[1] for nome, pila in self._pile.items()}
+
+    def pile(self, categoria: str) -> tuple:
+        """Le pile (item, quantità) di una categoria; ricalcolate solo dopo una modifica"""
+        if self._viste is None: self._viste = {}
+        vista = self._viste.get(categoria)
+        if vista is None:
+            vista = tuple((self._pile[nome][0], self._pile[nome][1]) for nome in self._categorie.get(categoria.lower(), ()))
+            self._viste[categoria] = vista
+        return vista
+
+    def conta_categoria(self, categoria: str) -> int:
+        return sum(quantita for _, quantita in self.pile(categoria))
+
+    def __contains__(self, nome: str) -> bool:
+        return nome in self._pile
 
     def __iter__(self) -> InventoryIterator:
         return InventoryIterator(self._items)
@@ -78,35 +314,651 @@ class Inventory(Iterable):
 # ==========================================
 
 class CharacterMemento:
+    """
+    Lo stato di un personaggio. L'inventario è la tupla immutabile dell'Inventory, condivisa
+    con gli altri memento finché non cambia: uno snapshot copia solo i pochi campi scalari.
+    """
+    __slots__ = ("_state",)
+
     def __init__(self, state: Dict[str, Any]):
         self._state = state
 
     def get_state(self) -> Dict[str, Any]:
-        return self._state
+        """Una copia da serializzare (l'inventario torna una lista)"""
+        stato = dict(self._state)
+        if isinstance(stato.get("inventario"), tuple): stato["inventario"] = list(stato["inventario"])
+        return stato
+
+    def corrisponde(self, player: Player) -> bool:
+        """True se il player è ancora esattamente in questo stato (il memento si può riusare)"""
+        s = self._state
+        return (s.get("hp") == player._hp and s.get("moralita") == player._moralita and s.get("nome") == player.nome
+                and s.get("max_hp") == player._max_hp and s.get("type") == type(player).__name__
+                and s.get("inventario") == player._inventario.istantanea())
+
+class StoricoStati:
+    """
+    Caretaker dei memento: checkpoint dei giocatori in un buffer circolare (al massimo `capacita`,
+    i più vecchi escono) con annulla/ripeti. Un giocatore non cambiato dall'ultimo checkpoint
+    riusa lo stesso memento, quindi un checkpoint costa al più un piccolo dizionario per giocatore
+    e si può prendere a ogni turno.
+    """
+    def __init__(self, capacita: int = 32):
+        self.capacita = capacita
+        self._passato: deque = deque(maxlen=capacita)
+        self._futuro: List[tuple] = []
+        self._ultimo: tuple = ()
+        self.riusati = 0
+
+    def __len__(self):
+        return len(self._passato)
+
+    def puo_annullare(self) -> bool:
+        return bool(self._passato)
+
+    def puo_ripetere(self) -> bool:
+        return bool(self._futuro)
+
+    def svuota(self) -> None:
+        self._passato.clear()
+        self._futuro.clear()
+        self._ultimo = ()
+
+    def _mementi(self, giocatori: List[Player]) -> tuple:
+        precedenti = self._ultimo
+        mementi = []
+        for i, p in enumerate(giocatori):
+            m = precedenti[i] if i < len(precedenti) else None
+            if m is not None and m.corrisponde(p): self.riusati += 1
+            else: m = p.save_state()
+            mementi.append(m)
+        self._ultimo = tuple(mementi)
+        return self._ultimo
+
+    def salva(self, giocatori: List[Player]) -> None:
+        """Checkpoint (es. prima di un combattimento o di un turno): cancella i passi da ripetere"""
+        self._passato.append(self._mementi(giocatori))
+        self._futuro.clear()
+
+    def annulla(self, giocatori: List[Player]) -> bool:
+        if not self._passato: return False
+        self._futuro.append(self._mementi(giocatori))
+        self._ripristina(giocatori, self._passato.pop())
+        return True
+
+    def ripeti(self, giocatori: List[Player]) -> bool:
+        if not self._futuro: return False
+        self._passato.append(self._mementi(giocatori))
+        self._ripristina(giocatori, self._futuro.pop())
+        return True
+
+    def _ripristina(self, giocatori: List[Player], mementi: tuple) -> None:
+        for p, m in zip(giocatori, mementi):
+            if m.corrisponde(p): continue
+            hp, moralita, versione = p.hp, p.moralita, p._inventario.versione
+            p.restore_state(m)
+            with p.batch(): # HUD e autosave vedono solo i campi davvero cambiati
+                p.notify(Cambiamento("hp", hp, p.hp), Cambiamento("moralita", moralita, p.moralita),
+                         Cambiamento("inventario", versione, p._inventario.versione))
+        self._ultimo = mementi
+
+# ---------- FORMATI DI SALVATAGGIO (CODEC) ----------
+
+class SaveCodec(ABC):
+    """Trasforma la lista di stati dei giocatori in byte e viceversa"""
+    nome = ""
+
+    @abstractmethod
+    def codifica(self, stati: List[Dict[str, Any]]) -> bytes: pass
+
+    @abstractmethod
+    def decodifica(self, dati: bytes) -> List[Dict[str, Any]]: pass
+
+    @abstractmethod
+    def riconosce(self, dati: bytes) -> bool: pass
+
+class CodecJSON(SaveCodec):
+    """Il formato storico: JSON indentato e leggibile"""
+    nome = "json"
+
+    def codifica(self, stati):
+        return json.dumps(stati, indent=4).encode("utf-8")
+
+    def decodifica(self, dati):
+        return json.loads(dati.decode("utf-8"))
+
+    def riconosce(self, dati):
+        return dati.lstrip()[:1] == b"["
+
+class CodecJSONCompatto(SaveCodec):
+    """JSON senza spazi e con chiavi corte, dentro un oggetto con il numero di versione"""
+    nome = "json_compatto"
+    VERSIONE = 1
+    CHIAVI_CORTE = {"type": "t", "nome": "n", "moralita": "m", "hp": "h", "max_hp": "x", "inventario": "i"}
+    CHIAVI_LUNGHE = {corta: lunga for lunga, corta in CHIAVI_CORTE.items()}
+
+    def codifica(self, stati):
+        giocatori = [{self.CHIAVI_CORTE.get(k, k): v for k, v in s.items()} for s in stati]
+        return json.dumps({"v": self.VERSIONE, "p": giocatori}, separators=(",", ":")).encode("utf-8")
+
+    def decodifica(self, dati):
+        contenuto = json.loads(dati.decode("utf-8"))
+        if contenuto.get("v") != self.VERSIONE:
+            raise ValueError(f"Versione del salvataggio compatto non supportata: {contenuto.get('v')}")
+        return [{self.CHIAVI_LUNGHE.get(k, k): v for k, v in g.items()} for g in contenuto["p"]]
+
+    def riconosce(self, dati):
+        return dati.lstrip()[:1] == b"{"
+
+class CodecBinario(SaveCodec):
+    """
+    Formato binario con intestazione versionata: b"BTS" + versione, poi per ogni giocatore
+    tipo, nome, moralita/hp/max_hp (interi a 32 bit) e oggetti: dalla versione 2 l'id del
+    catalogo su 16 bit (0 seguito dal nome per i salvataggi vecchi), nella 1 solo nomi.
+    Dalla versione 3 gli oggetti fuori catalogo hanno l'id FUORI_CATALOGO seguito da nome,
+    tipo, valore ed effetto. Eventuali campi in più finiscono in un piccolo blocco JSON,
+    così nulla va perso.
+    """
+    nome = "binario"
+    MAGIC = b"BTS"
+    VERSIONE = 3
+    VERSIONI_LEGGIBILI = (1, 2, 3)
+    FUORI_CATALOGO = 0xFFFF
+    CAMPI_FISSI = ("type", "nome", "moralita", "hp", "max_hp", "inventario")
+
+    def codifica(self, stati):
+        parti = [self.MAGIC, bytes([self.VERSIONE]), struct.pack("<H", len(stati))]
+        for s in stati:
+            parti.append(self._stringa(s.get("type", "Player1")))
+            parti.append(self._stringa(s["nome"]))
+            parti.append(struct.pack("<iii", s["moralita"], s.get("hp", 100), s.get("max_hp", 100)))
+            inventario = s.get("inventario", [])
+            parti.append(struct.pack("<H", len(inventario)))
+            for voce in inventario:
+                if isinstance(voce, int):
+                    parti.append(struct.pack("<H", voce))
+                elif isinstance(voce, dict):
+                    parti.append(struct.pack("<H", self.FUORI_CATALOGO) + self._stringa(voce["nome"]) + self._stringa(voce["tipo"])
+                                 + struct.pack("<i", voce["valore"]) + self._stringa(voce.get("effetto") or ""))
+                else:
+                    parti.append(struct.pack("<H", 0) + self._stringa(voce))
+            extra = {k: v for k, v in s.items() if k not in self.CAMPI_FISSI}
+            parti.append(self._stringa(json.dumps(extra, separators=(",", ":")) if extra else ""))
+        return b"".join(parti)
+
+    def decodifica(self, dati):
+        if not self.riconosce(dati):
+            raise ValueError("Intestazione del salvataggio binario non valida")
+        versione = dati[3]
+        if versione not in self.VERSIONI_LEGGIBILI:
+            raise ValueError(f"Versione del salvataggio binario non supportata: {versione}")
+        pos = 4
+        (n,) = struct.unpack_from("<H", dati, pos); pos += 2
+        stati = []
+        for _ in range(n):
+            tipo, pos = self._leggi_stringa(dati, pos)
+            nome, pos = self._leggi_stringa(dati, pos)
+            moralita, hp, max_hp = struct.unpack_from("<iii", dati, pos); pos += 12
+            (n_item,) = struct.unpack_from("<H", dati, pos); pos += 2
+            inventario = []
+            for _ in range(n_item):
+                if versione >= 2:
+                    (id_item,) = struct.unpack_from("<H", dati, pos); pos += 2
+                    if versione >= 3 and id_item == self.FUORI_CATALOGO:
+                        nome_item, pos = self._leggi_stringa(dati, pos)
+                        tipo_item, pos = self._leggi_stringa(dati, pos)
+                        (valore,) = struct.unpack_from("<i", dati, pos); pos += 4
+                        effetto, pos = self._leggi_stringa(dati, pos)
+                        voce = {"nome": nome_item, "tipo": tipo_item, "valore": valore}
+                        if effetto: voce["effetto"] = effetto
+                        inventario.append(voce)
+                        continue
+                    if id_item:
+                        inventario.append(id_item)
+                        continue
+                item, pos = self._leggi_stringa(dati, pos)
+                inventario.append(item)
+            extra, pos = self._leggi_stringa(dati, pos)
+            stato = {"type": tipo, "nome": nome, "moralita": moralita, "hp": hp, "max_hp": max_hp, "inventario": inventario}
+            if extra: stato.update(json.loads(extra))
+            stati.append(stato)
+        return stati
+
+    def riconosce(self, dati):
+        return dati[:3] == self.MAGIC and len(dati) > 3
+
+    @staticmethod
+    def _stringa(testo: str) -> bytes:
+        codificato = testo.encode("utf-8")
+        return struct.pack("<H", len(codificato)) + codificato
+
+    @staticmethod
+    def _leggi_stringa(dati: bytes, pos: int):
+        (lunghezza,) = struct.unpack_from("<H", dati, pos)
+        pos += 2
+        return dati[pos:pos + lunghezza].decode("utf-8"), pos + lunghezza
+
+CODEC_DISPONIBILI: List[SaveCodec] = [CodecBinario(), CodecJSONCompatto(), CodecJSON()]
+
+def rileva_codec(dati: bytes) -> SaveCodec:
+    """Riconosce il formato di un salvataggio dai primi byte"""
+    for codec in CODEC_DISPONIBILI:
+        if codec.riconosce(dati): return codec
+    raise ValueError("Formato del salvataggio non riconosciuto")
+
+class JournalSalvataggio:
+    """
+    Salvataggio incrementale: uno snapshot completo (il solito salvataggio_gioco.json)
+    più un giornale append-only di piccole modifiche (campo cambiato, oggetto aggiunto/rimosso).
+    Quando il giornale supera soglia_compattazione byte viene riassorbito in un nuovo snapshot.
+    La prima riga del giornale contiene il crc dello snapshot a cui si riferisce: se lo snapshot
+    è stato riscritto (compattazione interrotta a metà) le vecchie modifiche vengono ignorate.
+    Lo snapshot è scritto con il codec scelto; in lettura il formato viene riconosciuto da solo.
+    """
+    def __init__(self, percorso: str = "salvataggio_gioco.json", soglia_compattazione: int = 64 * 1024,
+                 codec: SaveCodec | None = None):
+        self.percorso = percorso
+        self.codec = codec or CodecJSON()
+        self.percorso_journal = os.path.splitext(percorso)[0] + ".journal"
+        self.soglia_compattazione = soglia_compattazione
+        self.record_scritti = 0
+        self.compattazioni = 0
+        self._ultimo_stato: List[Dict[str, Any]] | None = None # Ciò che è già su disco
+        self._dimensione_journal = 0
+        self._lock = threading.RLock()
+
+    def esiste(self) -> bool:
+        return os.path.exists(self.percorso)
+
+    def registra(self, stati: List[Dict[str, Any]]) -> None:
+        """Porta il disco allo stato indicato scrivendo solo le differenze"""
+        with self._lock:
+            if (self._ultimo_stato is None or len(stati) < len(self._ultimo_stato)
+                    or self._dimensione_journal > self.soglia_compattazione):
+                self.compatta(stati)
+                return
+
+            record = self._differenze(self._ultimo_stato, stati)
+            if not record: return
+            righe = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in record)
+            with open(self.percorso_journal, "a") as f:
+                f.write(righe)
+                f.flush()
+                os.fsync(f.fileno())
+            self._dimensione_journal += len(righe.encode("utf-8"))
+            self.record_scritti += len(record)
+            self._ultimo_stato = [_copia_stato(s) for s in stati]
+
+    def compatta(self, stati: List[Dict[str, Any]]) -> None:
+        """Riscrive lo snapshot completo e riparte con un giornale vuoto"""
+        with self._lock:
+            contenuto = self.codec.codifica(stati)
+            _scrivi_atomico(self.percorso, contenuto)
+            intestazione = json.dumps({"base": zlib.crc32(contenuto)}) + "\n"
+            _scrivi_atomico(self.percorso_journal, intestazione.encode("utf-8"))
+            self._dimensione_journal = len(intestazione)
+            self._ultimo_stato = [_copia_stato(s) for s in stati]
+            self.compattazioni += 1
+
+    def carica(self) -> List[Dict[str, Any]] | None:
+        """Legge lo snapshot e riapplica le modifiche del giornale"""
+        with self._lock:
+            if not os.path.exists(self.percorso): return None
+            with open(self.percorso, "rb") as f:
+                contenuto = f.read()
+            codec_file = rileva_codec(contenuto)
+            stati = codec_file.decodifica(contenuto)
+            self._dimensione_journal = 0
+            valido = False
+            if os.path.exists(self.percorso_journal):
+                with open(self.percorso_journal, "r") as f:
+                    righe = f.readlines()
+                self._dimensione_journal = sum(len(r.encode("utf-8")) for r in righe)
+                try:
+                    valido = bool(righe) and json.loads(righe[0]).get("base") == zlib.crc32(contenuto)
+                except ValueError:
+                    valido = False
+                if valido:
+                    for riga in righe[1:]:
+                        try:
+                            record = json.loads(riga)
+                        except ValueError:
+                            break # Ultima riga troncata da una chiusura improvvisa
+                        _applica_record(stati, record)
+            # Salvataggio in un formato diverso da quello scelto, o giornale assente/di un altro snapshot
+            # (salvataggi vecchi, slot importati, compattazione interrotta): la prossima scrittura
+            # riscrive lo snapshot e l'intestazione, altrimenti le modifiche finirebbero in un giornale ignorato
+            self._ultimo_stato = [_copia_stato(s) for s in stati] if valido and codec_file.nome == self.codec.nome else None
+            return stati
+
+    def migra(self) -> bool:
+        """Riscrive subito il salvataggio esistente nel formato del codec corrente"""
+        with self._lock:
+            stati = self.carica()
+            if stati is None: return False
+            self.compatta(stati)
+            return True
+
+    def cancella(self) -> None:
+        with self._lock:
+            for p in (self.percorso, self.percorso_journal):
+                if os.path.exists(p): os.remove(p)
+            self._ultimo_stato = None
+            self._dimensione_journal = 0
+
+    @staticmethod
+    def _differenze(vecchi: List[Dict[str, Any]], nuovi: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        record = []
+        for i, nuovo in enumerate(nuovi):
+            if i >= len(vecchi):
+                record.append({"id": i, "nuovo": nuovo})
+                continue
+            vecchio = vecchi[i]
+            for campo, valore in nuovo.items():
+                if campo != "inventario" and vecchio.get(campo) != valore:
+                    record.append({"id": i, "campo": campo, "valore": valore})
+            # Inventario: differenza tra multinsiemi di voci (id o definizioni)
+            rimasti = list(vecchio.get("inventario", []))
+            aggiunti = []
+            for nome in nuovo.get("inventario", []):
+                if nome in rimasti: rimasti.remove(nome)
+                else: aggiunti.append(nome)
+            record.extend({"id": i, "inv_remove": nome} for nome in rimasti)
+            record.extend({"id": i, "inv_add": nome} for nome in aggiunti)
+        return record
+
+def _copia_stato(stato: Dict[str, Any]) -> Dict[str, Any]:
+    copia = dict(stato)
+    copia["inventario"] = list(stato.get("inventario", []))
+    return copia
+
+def _applica_record(stati: List[Dict[str, Any]], record: Dict[str, Any]) -> None:
+    if "nuovo" in record:
+        stati.append(record["nuovo"])
+        return
+    stato = stati[record["id"]]
+    if "campo" in record:
+        stato[record["campo"]] = record["valore"]
+    elif "inv_add" in record:
+        stato.setdefault("inventario", []).append(record["inv_add"])
+    elif "inv_remove" in record and record["inv_remove"] in stato.get("inventario", []):
+        stato["inventario"].remove(record["inv_remove"])
+
+def _scrivi_atomico(percorso: str, contenuto: bytes) -> None:
+    """Scrive su un file temporaneo e poi lo rinomina: chi legge vede il vecchio o il nuovo file, mai metà"""
+    temporaneo = percorso + ".tmp"
+    with open(temporaneo, "wb") as f:
+        f.write(contenuto)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporaneo, percorso)
 
 class AutoSaveObserver(Observer):
+    """
+    Salvataggio automatico "debounced" su un thread in background.
+    update() segna solo lo stato come da salvare: il thread scrittore accorpa le modifiche
+    (al massimo una scrittura ogni intervallo_minimo secondi) e le passa al JournalSalvataggio,
+    così il thread di gioco non aspetta mai il disco.
+    """
+    def __init__(self, percorso: str = "salvataggio_gioco.json", intervallo_minimo: float = 0.5, asincrono: bool = True,
+                 soglia_compattazione: int = 64 * 1024, codec: SaveCodec | None = None, manager: GameManager | None = None):
+        self.percorso = percorso
+        self.manager = manager # La sessione di cui salva i giocatori (None = il GameManager globale)
+        self.journal = JournalSalvataggio(percorso, soglia_compattazione, codec)
+        self.intervallo_minimo = intervallo_minimo
+        self.asincrono = asincrono
+        self.salvataggi_eseguiti = 0
+        self._sporco = False
+        self._urgente = False
+        self._chiuso = False
+        self._ultimo_salvataggio = 0.0
+        self._condizione = threading.Condition()
+        self._lock_scrittura = threading.RLock()
+        self._thread: threading.Thread | None = None
+        # Funzioni chiamate dopo ogni scrittura riuscita: (percorso, stati, livello)
+        self.ascoltatori: List[Callable[[str, List[Dict[str, Any]], int], None]] = []
+
     def update(self, subject: Subject) -> None:
         if isinstance(subject, Player):
+            self.segna_da_salvare()
+
+    def cambia_percorso(self, percorso: str):
+        """Passa a un altro slot: salva prima ciò che è in sospeso su quello vecchio"""
+        self.flush()
+        with self._lock_scrittura:
+            self.percorso = percorso
+            self.journal = JournalSalvataggio(percorso, self.journal.soglia_compattazione, self.journal.codec)
+
+    def segna_da_salvare(self, urgente: bool = False):
+        if not self.asincrono:
             self._salva_giocatori_attivi()
+            return
+        with self._condizione:
+            self._sporco = True
+            self._urgente = self._urgente or urgente
+            if self._thread is None or not self._thread.is_alive():
+                self._chiuso = False
+                self._thread = threading.Thread(target=self._ciclo_scrittura, name="AutoSave", daemon=True)
+                self._thread.start()
+            self._condizione.notify()
+
+    def _ciclo_scrittura(self):
+        while True:
+            with self._condizione:
+                while not self._sporco and not self._chiuso:
+                    self._condizione.wait()
+                if not self._sporco:
+                    return # Chiuso e niente in sospeso
+                # Debounce: le modifiche che arrivano durante l'attesa finiscono nella stessa scrittura
+                attesa = self._ultimo_salvataggio + self.intervallo_minimo - time.monotonic()
+                if attesa > 0 and not self._urgente and not self._chiuso:
+                    self._condizione.wait(attesa)
+                    continue
+                self._sporco = False
+                self._urgente = False
+                # Prendiamo il lock prima di rilasciare la condizione: un flush() concorrente aspetterà questa scrittura
+                self._lock_scrittura.acquire()
+            try:
+                self._salva_giocatori_attivi()
+            finally:
+                self._lock_scrittura.release()
+
+    def flush(self, attendi: bool = True):
+        """Salva subito ciò che è in sospeso. Con attendi=False sveglia solo il thread (es. cambio livello)"""
+        if not attendi:
+            with self._condizione:
+                if self._sporco:
+                    self._urgente = True
+                    self._condizione.notify()
+            return
+        with self._condizione:
+            in_sospeso, self._sporco, self._urgente = self._sporco, False, False
+        if in_sospeso:
+            self._salva_giocatori_attivi()
+        else:
+            with self._lock_scrittura: pass # Aspetta un'eventuale scrittura già in corso
+
+    def scarta_in_sospeso(self):
+        """Dimentica le modifiche non ancora scritte (es. prima di cancellare il salvataggio)"""
+        with self._condizione:
+            self._sporco = False
+            self._urgente = False
+        with self._lock_scrittura: pass
+
+    def chiudi(self):
+        """Da chiamare all'uscita: scrive l'ultimo stato e ferma il thread"""
+        self.flush()
+        with self._condizione:
+            self._chiuso = True
+            self._condizione.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
 
     def _salva_giocatori_attivi(self):
-        manager = GameManager.get_instance()
+        manager = self.manager or GameManager.get_instance()
         if not manager.giocatori: return
-        try:
-            # Crea la lista di stati da salvare
-            stati = [p.save_state().get_state() for p in manager.giocatori]
-            # Scrittura fisica sul file
-            with open("salvataggio_gioco.json", "w") as f:
-                json.dump(stati, f, indent=4)
-            print("Log: Salvataggio completato correttamente.") # Aggiungi questo per debug
-        except Exception as e:
-            print(f"Errore critico durante il salvataggio: {e}")
+        with self._lock_scrittura:
+            try:
+                # Crea la lista di stati da salvare: sul disco finiscono solo le differenze
+                stati = [p.save_state().get_state() for p in list(manager.giocatori)]
+                self.journal.registra(stati)
+                self._ultimo_salvataggio = time.monotonic()
+                self.salvataggi_eseguiti += 1
+                for ascoltatore in self.ascoltatori:
+                    ascoltatore(self.percorso, stati, manager.livello_corrente)
+                print("Log: Salvataggio completato correttamente.") # Aggiungi questo per debug
+            except Exception as e:
+                print(f"Errore critico durante il salvataggio: {e}")
+
+# ---------- SLOT DI SALVATAGGIO ----------
+
+class InfoSlot:
+    """Metadati di uno slot, tenuti in memoria dal GestoreSlot"""
+    def __init__(self, nome: str, giocatori: List[str], livello: int, timestamp: float, dimensione: int):
+        self.nome = nome
+        self.giocatori = giocatori
+        self.livello = livello
+        self.timestamp = timestamp
+        self.dimensione = dimensione
+
+    def __repr__(self):
+        return f"InfoSlot({self.nome}, {self.giocatori}, Liv={self.livello}, {self.dimensione}B)"
+
+class GestoreSlot:
+    """
+    Più slot di salvataggio in una cartella. La cartella viene letta una volta (scansiona)
+    e i metadati restano in memoria: la GUI li consulta senza toccare il filesystem.
+    L'indice si aggiorna a ogni scrittura (registra_salvataggio, da collegare all'AutoSaveObserver)
+    oppure confrontando le date di modifica dei file (controlla_modifiche).
+    """
+    ESTENSIONE = ".sav"
+
+    def __init__(self, cartella: str = "salvataggi", legacy: str | None = "salvataggio_gioco.json"):
+        self.cartella = cartella
+        self.legacy = legacy
+        self.scansioni = 0
+        self._indice: Dict[str, InfoSlot] = {}
+        self._mtime: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    def percorso(self, nome: str) -> str:
+        return os.path.join(self.cartella, nome + self.ESTENSIONE)
+
+    def _file_slot(self, nome: str) -> List[str]:
+        base = os.path.join(self.cartella, nome)
+        return [base + self.ESTENSIONE, base + ".journal", base + ".meta"]
+
+    def scansiona(self) -> None:
+        """Lettura completa della cartella (all'avvio)"""
+        with self._lock:
+            os.makedirs(self.cartella, exist_ok=True)
+            self._importa_legacy()
+            self._indice.clear()
+            self._mtime.clear()
+            self.controlla_modifiche()
+
+    def controlla_modifiche(self) -> None:
+        """Rilegge solo gli slot i cui file sono cambiati da fuori (date di modifica diverse)"""
+        with self._lock:
+            if not os.path.isdir(self.cartella): return
+            self.scansioni += 1
+            mtime_correnti: Dict[str, float] = {}
+            for entry in os.scandir(self.cartella):
+                nome, estensione = os.path.splitext(entry.name)
+                if estensione in (self.ESTENSIONE, ".journal", ".meta"):
+                    mtime_correnti[nome] = max(mtime_correnti.get(nome, 0.0), entry.stat().st_mtime)
+            for nome, mtime in mtime_correnti.items():
+                if self._mtime.get(nome) != mtime and os.path.exists(self.percorso(nome)):
+                    self._leggi_slot(nome)
+            for nome in list(self._indice):
+                if nome not in mtime_correnti:
+                    del self._indice[nome]
+                    self._mtime.pop(nome, None)
+
+    def _leggi_slot(self, nome: str) -> None:
+        meta = {}
+        percorso_meta = self._file_slot(nome)[2]
+        if os.path.exists(percorso_meta):
+            try:
+                with open(percorso_meta, "r") as f:
+                    meta = json.load(f)
+            except ValueError:
+                meta = {}
+        giocatori = meta.get("giocatori")
+        if giocatori is None:
+            try:
+                giocatori = [s["nome"] for s in JournalSalvataggio(self.percorso(nome)).carica() or []]
+            except Exception:
+                return # Slot illeggibile: non lo mostriamo
+        self._aggiorna_indice(nome, giocatori, meta.get("livello", 1))
+
+    def _aggiorna_indice(self, nome: str, giocatori: List[str], livello: int) -> None:
+        presenti = [p for p in self._file_slot(nome) if os.path.exists(p)]
+        stat = [os.stat(p) for p in presenti]
+        self._mtime[nome] = max((st.st_mtime for st in stat), default=0.0)
+        dimensione = sum(st.st_size for p, st in zip(presenti, stat) if not p.endswith(".meta"))
+        self._indice[nome] = InfoSlot(nome, giocatori, livello, self._mtime[nome], dimensione)
+
+    def registra_salvataggio(self, percorso: str, stati: List[Dict[str, Any]], livello: int) -> None:
+        """Ascoltatore dell'AutoSaveObserver: aggiorna l'indice dopo una scrittura (gira sul thread di salvataggio)"""
+        cartella, file = os.path.split(percorso)
+        nome, estensione = os.path.splitext(file)
+        if estensione != self.ESTENSIONE or os.path.abspath(cartella) != os.path.abspath(self.cartella): return
+        giocatori = [s["nome"] for s in stati]
+        with self._lock:
+            vecchio = self._indice.get(nome)
+            if vecchio is None or vecchio.giocatori != giocatori or vecchio.livello != livello:
+                # Il file .meta cambia raramente (nuovi giocatori o nuovo livello)
+                _scrivi_atomico(self._file_slot(nome)[2], json.dumps({"giocatori": giocatori, "livello": livello}).encode("utf-8"))
+            self._aggiorna_indice(nome, giocatori, livello)
+
+    def elenco(self) -> List[InfoSlot]:
+        """Slot dal più recente al più vecchio (solo memoria)"""
+        with self._lock:
+            return sorted(self._indice.values(), key=lambda info: info.timestamp, reverse=True)
+
+    def info(self, nome: str) -> InfoSlot | None:
+        return self._indice.get(nome)
+
+    def ha_slot(self) -> bool:
+        return bool(self._indice)
+
+    def nuovo_nome(self) -> str:
+        with self._lock:
+            n = len(self._indice) + 1
+            while f"partita_{n}" in self._indice or os.path.exists(self.percorso(f"partita_{n}")):
+                n += 1
+            return f"partita_{n}"
+
+    def cancella(self, nome: str) -> None:
+        with self._lock:
+            for p in self._file_slot(nome):
+                if os.path.exists(p): os.remove(p)
+            self._indice.pop(nome, None)
+            self._mtime.pop(nome, None)
+
+    def cancella_tutti(self) -> None:
+        for nome in list(self._indice):
+            self.cancella(nome)
+
+    def _importa_legacy(self) -> None:
+        """Il vecchio salvataggio unico diventa uno slot come gli altri"""
+        if not self.legacy or not os.path.exists(self.legacy): return
+        nome = os.path.splitext(os.path.basename(self.legacy))[0]
+        if os.path.exists(self.percorso(nome)): return
+        os.replace(self.legacy, self.percorso(nome))
+        journal_legacy = os.path.splitext(self.legacy)[0] + ".journal"
+        if os.path.exists(journal_legacy):
+            os.replace(journal_legacy, self._file_slot(nome)[1])
 
 # ==========================================
 # 4. PLAYER (Sincronizzato con Inventario)
 # ==========================================
 
 class Player(Subject, ABC):
+    __slots__ = ("nome", "_moralita", "_max_hp", "_hp", "_inventario")
+
     def __init__(self, nome: str, moralita: int):
         super().__init__()
         self.nome = nome
@@ -121,16 +973,16 @@ class Player(Subject, ABC):
     @moralita.setter
     def moralita(self, valore: int):
         if valore != self._moralita:
-            self._moralita = valore
-            self.notify()
+            vecchio, self._moralita = self._moralita, valore
+            self.notify(Cambiamento("moralita", vecchio, valore))
 
     @property
     def hp(self) -> int: return self._hp
 
     @hp.setter
     def hp(self, valore: int):
-        self._hp = max(0, min(valore, self._max_hp))
-        self.notify()
+        vecchio, self._hp = self._hp, max(0, min(valore, self._max_hp))
+        self.notify(Cambiamento("hp", vecchio, self._hp))
 
     @property
     def max_hp(self) -> int: return self._max_hp
@@ -138,44 +990,49 @@ class Player(Subject, ABC):
     def take_damage(self, amount: int): self.hp -= amount
     def heal(self, amount: int): self.hp += amount
 
+    def usa_item(self, nome: str) -> bool:
+        """Consuma un oggetto dell'inventario: le cure ridanno HP"""
+        versione = self._inventario.versione
+        item = self._inventario.usa(nome)
+        if item is None: return False
+        with self.batch(): # HP e inventario cambiano insieme: una sola notifica
+            effetto = EFFETTI_OGGETTI.get(item.effetto)
+            if effetto: effetto(self, item) # Le cure ridanno HP
+            self.notify(Cambiamento("inventario", versione, self._inventario.versione))
+        return True
+
     # ---------- MEMENTO AGGIORNATO ----------
     def save_state(self) -> CharacterMemento:
-        # Salviamo i nomi degli oggetti come lista di stringhe
-        nomi_item = [item.nome for item in self._inventario]
+        # Salviamo gli id del catalogo (la definizione completa per gli oggetti che non ci sono), in una tupla condivisa
         return CharacterMemento({
             "type": self.__class__.__name__,
             "nome": self.nome,
             "moralita": self._moralita,
             "hp": self._hp,
             "max_hp": self._max_hp,
-            "inventario": nomi_item  # Salva gli item!
+            "inventario": self._inventario.istantanea()  # Salva gli item!
         })
 
     def restore_state(self, memento: CharacterMemento) -> None:
-        state = memento.get_state()
+        state = memento._state # L'originator legge il memento senza copiarlo
         self.nome = state["nome"]
         self._moralita = state["moralita"]
         self._hp = state.get("hp", 100)
         self._max_hp = state.get("max_hp", 100)
         
-        # RIPRISTINO INTELLIGENTE DELL'INVENTARIO
+        # RIPRISTINO DELL'INVENTARIO: ogni voce è un id (o un nome, nei salvataggi vecchi) del catalogo
+        voci = tuple(state.get("inventario", ()))
+        if voci == self._inventario.istantanea(): return # Stesso contenuto: l'inventario resta quello
         self._inventario = Inventory()
-        nomi_caricati = state.get("inventario", [])
-        
-        for nome in nomi_caricati:
-            # Assegniamo la categoria corretta in base al nome dell'oggetto
-            tipo = "Utility" # Valore di default
-            if nome.lower() == "spada":
-                tipo = "Attacco"
-            elif nome.lower() == "pozione":
-                tipo = "Cura"
-            
-            self._inventario.add_item(Item(nome, tipo, 20))
+        for voce in voci:
+            self._inventario.add_item(catalogo_oggetti.da_salvataggio(voce))
 
 class Player1(Player):
+    __slots__ = ()
     def __repr__(self): return f"Player1({self.nome}, HP={self.hp})"
 
 class Player2(Player):
+    __slots__ = ()
     def __repr__(self): return f"Player2({self.nome}, HP={self.hp})"
 
 # ==========================================
@@ -199,6 +1056,8 @@ class Player2Creator(CharacterCreator):
 # ==============================================================================
 
 class Mostro(ABC):
+    __slots__ = () # Le sottoclassi "leggere" (registro, pool) possono fare a meno del __dict__
+
     def __init__( self, nome: str, hp: int, danno: int, furtivita: int, intelligenza: int):
         self.nome = nome
         self.hp = hp
@@ -216,39 +1075,54 @@ class Mostro(ABC):
     @abstractmethod
     def attacca(self, player) -> None:
         pass
+
+class MostroClassico(Mostro):
+    """Base dei mostri definiti come classi: le statistiche stanno in slot propri"""
+    __slots__ = ("nome", "hp", "danno", "furtivita", "intelligenza")
+
 # ---------- CONCRETE PRODUCTS ----------
 
-class Goblin(Mostro):
+class Goblin(MostroClassico):
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__( nome="Goblin", hp=40, danno=10, furtivita=8, intelligenza=4)
+        super().__init__(**registro_mostri.get("goblin").statistiche())
 
     def attacca(self, player) -> None:
         player.take_damage(self.danno)
 
-class Anubi(Mostro):
+class Anubi(MostroClassico):
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__(nome="Anubi", hp=80, danno=15, furtivita=1, intelligenza=2)
+        super().__init__(**registro_mostri.get("anubi").statistiche())
 
     def attacca(self, player) -> None:
         player.take_damage(self.danno)
 
-class Chica(Mostro):
+class Chica(MostroClassico):
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__(nome="Chica",hp=100, danno=20, furtivita=8, intelligenza=4)
+        super().__init__(**registro_mostri.get("chica").statistiche())
 
     def attacca(self, player) -> None:
         player.take_damage(self.danno)
 
-class Yeti(Mostro):
+class Yeti(MostroClassico):
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__(nome="Yeti delle Nevi", hp=140, danno=30, furtivita=7, intelligenza=5)
+        super().__init__(**registro_mostri.get("yeti").statistiche())
 
     def attacca(self, player) -> None:
         player.take_damage(self.danno)
 
-class SerpenteTreTeste(Mostro):
+class SerpenteTreTeste(MostroClassico):
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__(nome="Serpente a Tre Teste", hp=200, danno=70, furtivita=10, intelligenza=10)
+        super().__init__(**registro_mostri.get("serpente").statistiche())
 
     def attacca(self, player) -> None:
         player.take_damage(self.danno)
@@ -283,15 +1157,124 @@ class SerpenteTreTesteCreator(MostroCreator):
     def factory_method(self) -> Mostro:
         return SerpenteTreTeste()
 
+# ---------- REGISTRO DEI TIPI (FLYWEIGHT + PROTOTYPE) ----------
+# I mostri sono dati: aggiungere una riga alla tabella basta per averne uno nuovo.
+
+def attacco_diretto(mostro: Mostro, player) -> None:
+    player.take_damage(mostro.danno)
+
+ATTACCHI: Dict[str, Callable[[Mostro, Any], None]] = {
+    "diretto": attacco_diretto,
+}
+
+TABELLA_MOSTRI = [
+    {"id": "goblin", "nome": "Goblin", "hp": 40, "danno": 10, "furtivita": 8, "intelligenza": 4, "attacco": "diretto"},
+    {"id": "anubi", "nome": "Anubi", "hp": 80, "danno": 15, "furtivita": 1, "intelligenza": 2, "attacco": "diretto"},
+    {"id": "chica", "nome": "Chica", "hp": 100, "danno": 20, "furtivita": 8, "intelligenza": 4, "attacco": "diretto"},
+    {"id": "yeti", "nome": "Yeti delle Nevi", "hp": 140, "danno": 30, "furtivita": 7, "intelligenza": 5, "attacco": "diretto"},
+    {"id": "serpente", "nome": "Serpente a Tre Teste", "hp": 200, "danno": 70, "furtivita": 10, "intelligenza": 10, "attacco": "diretto"},
+]
+
+class TipoMostro:
+    """Flyweight: le statistiche base di un tipo, condivise (e mai modificate) da tutte le sue istanze"""
+    __slots__ = ("id", "nome", "hp", "danno", "furtivita", "intelligenza", "attacco")
+
+    def __init__(self, id: str, nome: str, hp: int, danno: int, furtivita: int, intelligenza: int, attacco: str = "diretto"):
+        if attacco not in ATTACCHI: raise ValueError(f"Attacco sconosciuto per {id}: {attacco}")
+        self.id, self.nome, self.hp, self.danno = id, nome, hp, danno
+        self.furtivita, self.intelligenza, self.attacco = furtivita, intelligenza, attacco
+
+    def statistiche(self) -> Dict[str, Any]:
+        return {"nome": self.nome, "hp": self.hp, "danno": self.danno, "furtivita": self.furtivita, "intelligenza": self.intelligenza}
+
+    def __repr__(self):
+        return f"TipoMostro({self.id})"
+
+class MostroIstanza(Mostro):
+    """Un mostro del registro: porta con sé solo gli HP, il resto lo legge dal suo TipoMostro"""
+    __slots__ = ("tipo", "hp")
+
+    def __init__(self, tipo: TipoMostro):
+        self.tipo = tipo
+        self.hp = tipo.hp
+
+    @property
+    def nome(self) -> str: return self.tipo.nome
+    @property
+    def danno(self) -> int: return self.tipo.danno
+    @property
+    def furtivita(self) -> int: return self.tipo.furtivita
+    @property
+    def intelligenza(self) -> int: return self.tipo.intelligenza
+
+    def attacca(self, player) -> None:
+        ATTACCHI[self.tipo.attacco](self, player)
+
+    def __repr__(self):
+        return f"{self.tipo.nome}(HP={self.hp})"
+
+class RegistroMostri:
+    def __init__(self, righe: List[Dict[str, Any]] | None = None):
+        self._tipi: Dict[str, TipoMostro] = {}
+        if righe: self.carica(righe)
+
+    def carica(self, righe: List[Dict[str, Any]]) -> None:
+        for riga in righe:
+            self.registra(TipoMostro(**riga))
+
+    def carica_json(self, percorso: str) -> None:
+        with open(percorso, "r", encoding="utf-8") as f:
+            self.carica(json.load(f))
+
+    def registra(self, tipo: TipoMostro) -> None:
+        self._tipi[tipo.id] = tipo
+
+    def get(self, id: str) -> TipoMostro:
+        try:
+            return self._tipi[id]
+        except KeyError:
+            raise KeyError(f"Mostro sconosciuto: {id}") from None
+
+    def tipi(self) -> List[str]:
+        return list(self._tipi)
+
+    def crea_mostro(self, id: str) -> MostroIstanza:
+        return MostroIstanza(self.get(id))
+
+    def crea_mostri(self, id: str, n: int) -> List[MostroIstanza]:
+        """n copie del prototipo: ogni istanza costa un oggetto con due slot"""
+        tipo = self.get(id)
+        return [MostroIstanza(tipo) for _ in range(n)]
+
+class CreatorRegistro(MostroCreator):
+    """Creator generico per i tipi del registro (niente sottoclassi per i mostri nuovi)"""
+    def __init__(self, id: str, registro: RegistroMostri | None = None):
+        self.tipo = (registro or registro_mostri).get(id)
+
+    def factory_method(self) -> Mostro:
+        return MostroIstanza(self.tipo)
+
+registro_mostri = RegistroMostri(TABELLA_MOSTRI)
+
+def crea_mostri(tipo: str, n: int) -> List[MostroIstanza]:
+    return registro_mostri.crea_mostri(tipo, n)
+
 # ==========================================
-# 7. GAMEMANAGER (SINGLETON)
+# 7. GAMEMANAGER (SINGLETON + SESSIONI)
 # ==========================================
 
 class GameManager:
+    """
+    Senza sessione è il singleton della partita locale (get_instance). Con una sessione è
+    uno dei tanti manager di un RegistroSessioni, ognuno con i suoi giocatori e il suo bus.
+    """
     _instance = None
-    def __init__(self):
-        if GameManager._instance is not None: raise Exception("Singleton violation")
-        GameManager._instance = self
+    def __init__(self, sessione: str | None = None, bus: BusEventi | None = None):
+        if sessione is None:
+            if GameManager._instance is not None: raise Exception("Singleton violation")
+            GameManager._instance = self
+        self.sessione = sessione
+        self.bus = bus or (bus_eventi if sessione is None else BusEventi())
         self.resetGameData()
 
     @staticmethod
@@ -303,35 +1286,56 @@ class GameManager:
         self.livello_corrente = 1
         self.vite_rimanenti = 5
         self.giocatori: List[Player] = []
+        self.bus.pubblica(GiocatoriCambiati(self.giocatori))
         print("Log: Dati di gioco resettati.")
 
+    def aggiungi_giocatore(self, player: Player) -> None:
+        """Il player entra nella partita e da qui in poi pubblica i suoi cambiamenti sul bus"""
+        self.giocatori.append(player)
+        player.bus = self.bus
+        self.bus.pubblica(GiocatoriCambiati(self.giocatori))
+
 # ==========================================
 # 8. FACADE
 # ==========================================
 
 class GameFacade:
-    def __init__(self, manager: GameManager, auto_saver: AutoSaveObserver | None = None):
+    def __init__(self, manager: GameManager, auto_saver: AutoSaveObserver | None = None, percorso: str = "salvataggio_gioco.json",
+                 codec: SaveCodec | None = None):
         self.manager = manager
         self.auto_saver = auto_saver
+        self.storico = StoricoStati() # Checkpoint per annulla/ripeti
+        if auto_saver and auto_saver.manager is None: auto_saver.manager = manager # Salva i giocatori di questa sessione
+        self._journal = None if auto_saver else JournalSalvataggio(percorso)
+        if codec: self.journal.codec = codec
+
+    @property
+    def journal(self) -> JournalSalvataggio:
+        # Stesso journal dell'autosave: dopo un caricamento le scritture successive sono solo differenze
+        return self.auto_saver.journal if self.auto_saver else self._journal
+
+    def usa_percorso(self, percorso: str) -> None:
+        """Sceglie lo slot su cui caricare e salvare"""
+        if self.auto_saver: self.auto_saver.cambia_percorso(percorso)
+        else: self._journal = JournalSalvataggio(percorso, self._journal.soglia_compattazione, self._journal.codec)
 
     def crea_personaggio_completo(self, creator: CharacterCreator, player_id: int, nome_inserito: str = "", scelta_fatta: str = None) -> Player:
         nome = valida_nome(nome_inserito, player_id)
         player = creator.create_character(nome, 0)
-        self.manager.giocatori.append(player)
+        self.manager.aggiungi_giocatore(player)
         if self.auto_saver: player.attach(self.auto_saver)
         assegna_moralita(player, scelta_fatta)
         return player
 
     def carica_da_disco(self) -> bool:
-        if not os.path.exists("salvataggio_gioco.json"): return False
+        if not self.journal.esiste(): return False
         try:
-            with open("salvataggio_gioco.json", "r") as f:
-                dati = json.load(f)
+            dati = self.journal.carica()
             self.manager.giocatori.clear()
             for d in dati:
                 p = Player2(d["nome"], d["moralita"]) if d.get("type") == "Player2" else Player1(d["nome"], d["moralita"])
                 p.restore_state(CharacterMemento(d))
-                self.manager.giocatori.append(p)
+                self.manager.aggiungi_giocatore(p)
                 if self.auto_saver: p.attach(self.auto_saver)
                 print(f"Log: Ripristinato {p.nome} (Moralità: {p.moralita}, HP: {p.hp}), Item: {p._inventario}")
             return True
@@ -340,10 +1344,98 @@ class GameFacade:
             return False
 
     def esiste_salvataggio(self) -> bool:
-        return os.path.exists("salvataggio_gioco.json")
+        return self.journal.esiste()
+
+    def migra_salvataggio(self) -> bool:
+        """Converte il salvataggio su disco nel formato scelto per questa facade"""
+        if self.auto_saver: self.auto_saver.flush()
+        return self.journal.migra()
+
+    def cancella_salvataggio(self) -> None:
+        """Elimina snapshot e giornale (le scritture in sospeso vengono scartate prima)"""
+        if self.auto_saver: self.auto_saver.scarta_in_sospeso()
+        self.journal.cancella()
+
+# ==========================================
+# 9. SESSIONI
+# ==========================================
+
+class Sessione:
+    """Una partita con manager, facade e salvataggi tutti suoi"""
+    def __init__(self, id: str, manager: GameManager, facade: GameFacade, gestore_slot: GestoreSlot | None = None):
+        self.id = id
+        self.manager = manager
+        self.facade = facade
+        self.gestore_slot = gestore_slot
+
+    @property
+    def auto_saver(self) -> AutoSaveObserver | None:
+        return self.facade.auto_saver
+
+    def chiudi(self) -> None:
+        if self.auto_saver: self.auto_saver.chiudi()
+
+    def __repr__(self):
+        return f"Sessione({self.id}, giocatori={len(self.manager.giocatori)})"
+
+class RegistroSessioni:
+    """
+    Tante partite nello stesso processo (bot, test automatici, server), indicizzate per id.
+    Con una cartella, ogni sessione ha la sua sottocartella di slot e un autosave legato
+    al proprio manager; senza cartella le sessioni vivono solo in memoria.
+    """
+    def __init__(self, cartella: str | None = None, codec: SaveCodec | None = None, autosave_asincrono: bool = True):
+        self.cartella = cartella
+        self.codec = codec
+        self.autosave_asincrono = autosave_asincrono
+        self._sessioni: Dict[str, Sessione] = {}
+        self._progressivo = 0
+        self._lock = threading.Lock()
+
+    def crea(self, id: str | None = None) -> Sessione:
+        with self._lock:
+            if id is None:
+                self._progressivo += 1
+                while f"sessione_{self._progressivo}" in self._sessioni: self._progressivo += 1
+                id = f"sessione_{self._progressivo}"
+            if id in self._sessioni: raise KeyError(f"Sessione già esistente: {id}")
+            manager = GameManager(sessione=id)
+            gestore_slot, auto_saver = None, None
+            if self.cartella:
+                gestore_slot = GestoreSlot(os.path.join(self.cartella, id), legacy=None)
+                gestore_slot.scansiona()
+                auto_saver = AutoSaveObserver(gestore_slot.percorso(gestore_slot.nuovo_nome()), asincrono=self.autosave_asincrono,
+                                              codec=self.codec, manager=manager)
+                auto_saver.ascoltatori.append(gestore_slot.registra_salvataggio)
+            facade = GameFacade(manager, auto_saver, percorso=f"{id}.json", codec=self.codec) # Percorso usato solo senza autosave
+            sessione = Sessione(id, manager, facade, gestore_slot)
+            self._sessioni[id] = sessione
+            return sessione
+
+    def get(self, id: str) -> Sessione:
+        return self._sessioni[id]
+
+    def chiudi(self, id: str) -> None:
+        """Scrive l'ultimo stato della sessione e la toglie dal registro"""
+        with self._lock:
+            sessione = self._sessioni.pop(id, None)
+        if sessione: sessione.chiudi()
+
+    def chiudi_tutte(self) -> None:
+        for id in list(self._sessioni):
+            self.chiudi(id)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._sessioni
+
+    def __len__(self):
+        return len(self._sessioni)
+
+    def __iter__(self) -> Iterator[Sessione]:
+        return iter(list(self._sessioni.values()))
 
 # ==========================================
-# 9. FUNZIONI SUPPORTO
+# 10. FUNZIONI SUPPORTO
 # ==========================================
 
 def valida_nome(nome: str, player_id: int) -> str:
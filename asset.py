@@ -0,0 +1,121 @@
+import io
+import pygame
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, List, Tuple
+
+# ==========================================
+# 1. CACHE DELLE SUPERFICI SCALATE
+# ==========================================
+
+class CacheScalature:
+    """
+    LRU delle immagini già scalate, chiave (asset, dimensione): tornando a una risoluzione
+    già vista (es. finestra <-> fullscreen) la scalatura non si ripete.
+    """
+    def __init__(self, capacita: int = 12):
+        self.capacita = capacita
+        self._superfici: OrderedDict = OrderedDict()
+        self.hit = 0
+        self.miss = 0
+
+    def scala(self, chiave, originale: pygame.Surface, dimensione: Tuple[int, int]) -> pygame.Surface:
+        voce = (chiave, tuple(dimensione))
+        superficie = self._superfici.get(voce)
+        if superficie is not None:
+            self.hit += 1
+            self._superfici.move_to_end(voce)
+            return superficie
+
+        self.miss += 1
+        superficie = pygame.transform.scale(originale, voce[1])
+        self._superfici[voce] = superficie
+        if len(self._superfici) > self.capacita:
+            self._superfici.popitem(last=False)
+        return superficie
+
+    def dimentica(self, chiave):
+        """Scarta tutte le scalature di un asset (es. l'originale è cambiato)"""
+        for voce in [v for v in self._superfici if v[0] == chiave]:
+            del self._superfici[voce]
+
+    def __len__(self):
+        return len(self._superfici)
+
+# ==========================================
+# 2. CARICAMENTO ASSET IN BACKGROUND
+# ==========================================
+
+class GestoreAsset:
+    """
+    Carica le immagini su un pool di thread: lettura del file e decodifica avvengono fuori
+    dal thread principale, mentre convert() (che tocca il display) viene fatto in aggiorna().
+    Finché un'immagine non è pronta, get() restituisce un segnaposto a tinta unita, così il
+    menu può comparire subito.
+    """
+    def __init__(self, max_thread: int = 2):
+        self._pool = ThreadPoolExecutor(max_thread, thread_name_prefix="Asset")
+        self._in_attesa: Dict[str, Tuple[Future, tuple]] = {}
+        self._immagini: Dict[str, pygame.Surface] = {}
+        self._pronti = set()
+        self.totale = 0
+        self.scalature = CacheScalature()
+
+    @staticmethod
+    def _decodifica(percorso: str) -> pygame.Surface:
+        with open(percorso, "rb") as f:
+            dati = f.read()
+        return pygame.image.load(io.BytesIO(dati), percorso)
+
+    @staticmethod
+    def _segnaposto(colore) -> pygame.Surface:
+        surf = pygame.Surface((800, 600))
+        surf.fill(colore)
+        return surf
+
+    def richiedi(self, chiave: str, percorso: str, colore_fallback) -> pygame.Surface:
+        """Mette in coda il caricamento; fino ad allora la chiave vale il segnaposto"""
+        self._immagini[chiave] = self._segnaposto(colore_fallback)
+        self._in_attesa[chiave] = (self._pool.submit(self._decodifica, percorso), colore_fallback)
+        self.totale += 1
+        return self._immagini[chiave]
+
+    def aggiorna(self) -> List[str]:
+        """Da chiamare nel loop principale: converte le immagini decodificate e ritorna le chiavi appena pronte"""
+        pronte = []
+        for chiave, (futuro, colore) in list(self._in_attesa.items()):
+            if not futuro.done(): continue
+            del self._in_attesa[chiave]
+            try:
+                self._immagini[chiave] = futuro.result().convert()
+                self.scalature.dimentica(chiave) # Le scalature fatte sul segnaposto non valgono più
+            except Exception as e:
+                print(f"Log: asset '{chiave}' non caricato ({e}), resta il segnaposto")
+            self._pronti.add(chiave)
+            pronte.append(chiave)
+        return pronte
+
+    def attendi(self):
+        """Blocca finché tutti gli asset richiesti sono pronti (utile per i test)"""
+        for futuro, _ in list(self._in_attesa.values()):
+            futuro.exception()
+        self.aggiorna()
+
+    def get(self, chiave: str) -> pygame.Surface:
+        return self._immagini[chiave]
+
+    def scalata(self, chiave: str, dimensione: Tuple[int, int]) -> pygame.Surface:
+        """L'asset alla dimensione richiesta (scalato solo la prima volta)"""
+        return self.scalature.scala(chiave, self._immagini[chiave], dimensione)
+
+    def pronto(self, chiave: str) -> bool:
+        return chiave in self._pronti
+
+    def progresso(self) -> float:
+        return len(self._pronti) / self.totale if self.totale else 1.0
+
+    def completato(self) -> bool:
+        return not self._in_attesa
+
+    def chiudi(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
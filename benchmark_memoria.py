@@ -0,0 +1,120 @@
+import argparse
+import gc
+import tracemalloc
+from typing import Callable, Dict
+
+from LogicaGioco import Player1, Item, Goblin, CharacterMemento, Mostro, catalogo_oggetti, registro_mostri
+from pool_mostri import MostroPool
+
+# ==========================================
+# MEMORIA PER ENTITÀ
+# ==========================================
+# Quanti byte costa in media ogni oggetto del gioco (misurati con tracemalloc su n istanze),
+# accanto alle stesse classi senza __slots__ (come erano prima).
+# Uso: python benchmark_memoria.py [--n 20000]
+
+def byte_per_istanza(crea: Callable[[int], object], n: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    prima = tracemalloc.get_traced_memory()[0]
+    oggetti = [crea(i) for i in range(n)]
+    dopo = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    lista = oggetti.__sizeof__() # La lista che li tiene in vita non fa parte del costo
+    del oggetti
+    return (dopo - prima - lista) / n
+
+def player_con_inventario(i: int, classe: Callable = Player1):
+    p = classe(f"P{i}", 5)
+    p._inventario.add_item(catalogo_oggetti.get(1))
+    p._inventario.add_item(catalogo_oggetti.get(2))
+    return p
+
+# ---------- RIFERIMENTO SENZA __slots__ ----------
+# Gli stessi attributi delle classi del gioco, ma in un __dict__ per istanza e con i contenitori
+# dell'observer creati subito: la forma che avevano prima degli slot.
+
+class ItemConDict:
+    def __init__(self, nome: str, tipo: str, valore: int, id: int | None = None, effetto: str | None = None):
+        self.nome = nome
+        self.tipo = tipo
+        self.valore = valore
+        self.id = id
+        self.effetto = effetto or ("cura" if tipo == "Cura" else None)
+
+class InventarioConDict:
+    def __init__(self):
+        self._items = []
+        self._pile = {}
+        self._categorie = {}
+        self._viste = {}
+        self.versione = 0
+
+    def add_item(self, item, quantita: int = 1):
+        pila = self._pile.get(item.nome)
+        if pila is None:
+            pila = self._pile[item.nome] = [item, 0]
+            self._categorie.setdefault(item.tipo.lower(), {})[item.nome] = None
+        pila[1] += quantita
+        self._items.extend([pila[0]] * quantita)
+        self.versione += 1
+        self._viste.clear()
+
+class PlayerConDict:
+    def __init__(self, nome: str, moralita: int):
+        # Subject
+        self._observers = {}
+        self._ordine = []
+        self._progressivo = 0
+        self._batch = 0
+        self._in_sospeso = {}
+        self.cambiamenti = ()
+        # Player
+        self.nome = nome
+        self._moralita = moralita
+        self._max_hp = 100
+        self._hp = 100
+        self._inventario = InventarioConDict()
+
+class MementoConDict:
+    def __init__(self, state):
+        self._state = state
+
+class GoblinConDict(Mostro):
+    def __init__(self):
+        super().__init__(**registro_mostri.get("goblin").statistiche())
+
+    def attacca(self, player) -> None:
+        player.take_damage(self.danno)
+
+def misura_riferimento(n: int = 20000) -> Dict[str, float]:
+    """Le stesse misure di misura(), sulle classi senza __slots__"""
+    return {
+        "player": byte_per_istanza(lambda i: PlayerConDict(f"P{i}", 5), n),
+        "player_con_2_oggetti": byte_per_istanza(lambda i: player_con_inventario(i, PlayerConDict), n),
+        "item": byte_per_istanza(lambda i: ItemConDict(f"Oggetto{i}", "Utility", i), n),
+        "memento": byte_per_istanza(lambda i: MementoConDict({"nome": f"P{i}"}), n),
+        "mostro_classe": byte_per_istanza(lambda i: GoblinConDict(), n),
+    }
+
+def misura(n: int = 20000) -> Dict[str, float]:
+    pool = MostroPool(n)
+    return {
+        "player": byte_per_istanza(lambda i: Player1(f"P{i}", 5), n),
+        "player_con_2_oggetti": byte_per_istanza(player_con_inventario, n),
+        "item": byte_per_istanza(lambda i: Item(f"Oggetto{i}", "Utility", i), n),
+        "memento": byte_per_istanza(lambda i: CharacterMemento({"nome": f"P{i}"}), n),
+        "mostro_classe": byte_per_istanza(lambda i: Goblin(), n),
+        "mostro_registro": byte_per_istanza(lambda i: registro_mostri.crea_mostro("goblin"), n),
+        "mostro_pool": pool.memoria_per_mostro(),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Byte per giocatore, oggetto e mostro, senza e con __slots__")
+    parser.add_argument("--n", type=int, default=20000)
+    args = parser.parse_args()
+    prima = misura_riferimento(args.n)
+    print(f"{'':22} {'senza slot':>12} {'con slot':>12}")
+    for nome, byte in misura(args.n).items():
+        riferimento = f"{prima[nome]:10.1f} B" if nome in prima else f"{'-':>12}"
+        print(f"{nome:22} {riferimento} {byte:10.1f} B")
@@ -0,0 +1,93 @@
+import pygame
+from collections import OrderedDict
+
+# ==========================================
+# 1. REGISTRO FONT CONDIVISO
+# ==========================================
+
+class RegistroFont:
+    """Crea ogni font (famiglia, dimensione, grassetto, corsivo) una sola volta e lo riusa."""
+    def __init__(self, capacita: int = 64):
+        self.capacita = capacita
+        self._font: OrderedDict = OrderedDict()
+        self.hit = 0
+        self.miss = 0
+
+    def get(self, famiglia: str, dimensione: int, bold: bool = False, italic: bool = False) -> pygame.font.Font:
+        chiave = (famiglia, int(dimensione), bool(bold), bool(italic))
+        font = self._font.get(chiave)
+        if font is not None:
+            self.hit += 1
+            self._font.move_to_end(chiave)
+            return font
+
+        # SysFont è lento (scansione dei font di sistema): lo paghiamo solo al primo uso
+        self.miss += 1
+        font = pygame.font.SysFont(famiglia, int(dimensione), bold=bold, italic=italic)
+        self._font[chiave] = font
+        if len(self._font) > self.capacita:
+            self._font.popitem(last=False)
+        return font
+
+    def svuota(self):
+        self._font.clear()
+
+    def __len__(self):
+        return len(self._font)
+
+# ==========================================
+# 2. CACHE DEI TESTI RENDERIZZATI (LRU)
+# ==========================================
+
+class CacheTesti:
+    """Conserva le superfici già renderizzate, chiave (font, testo, colore, antialias)."""
+    def __init__(self, capacita: int = 256):
+        self.capacita = capacita
+        self._superfici: OrderedDict = OrderedDict()
+        self.hit = 0
+        self.miss = 0
+
+    def render(self, font: pygame.font.Font, testo: str, colore, antialias: bool = True) -> pygame.Surface:
+        chiave = (font, testo, tuple(colore), antialias)
+        superficie = self._superfici.get(chiave)
+        if superficie is not None:
+            self.hit += 1
+            self._superfici.move_to_end(chiave)
+            return superficie
+
+        self.miss += 1
+        superficie = font.render(testo, antialias, colore)
+        self._superfici[chiave] = superficie
+        if len(self._superfici) > self.capacita:
+            self._superfici.popitem(last=False) # Scartiamo il testo usato meno di recente
+        return superficie
+
+    def svuota(self):
+        self._superfici.clear()
+
+    def __len__(self):
+        return len(self._superfici)
+
+# ==========================================
+# 3. ISTANZE CONDIVISE + SCORCIATOIE
+# ==========================================
+
+registro_font = RegistroFont()
+cache_testi = CacheTesti()
+
+def get_font(famiglia: str, dimensione: int, bold: bool = False, italic: bool = False) -> pygame.font.Font:
+    return registro_font.get(famiglia, dimensione, bold, italic)
+
+def render_testo(font: pygame.font.Font, testo: str, colore, antialias: bool = True) -> pygame.Surface:
+    return cache_testi.render(font, testo, colore, antialias)
+
+def statistiche_cache() -> dict:
+    """Contatori hit/miss di font e testi (utile per il debug delle prestazioni)"""
+    return {
+        "font_hit": registro_font.hit,
+        "font_miss": registro_font.miss,
+        "font_caricati": len(registro_font),
+        "testi_hit": cache_testi.hit,
+        "testi_miss": cache_testi.miss,
+        "testi_in_cache": len(cache_testi),
+    }
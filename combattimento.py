@@ -0,0 +1,166 @@
+from __future__ import annotations
+import random
+from contextlib import ExitStack
+from typing import List, Dict, Any
+from LogicaGioco import Player, Mostro, MostroCreator, Item, StoricoStati
+from eventi import BusEventi, CombattimentoFinito
+
+# ==========================================
+# 1. REGOLE
+# ==========================================
+# Nessuna dipendenza da pygame: un combattimento si può risolvere anche offline
+# (test, bilanciamento), e con lo stesso seed il risultato è sempre identico.
+
+DANNO_A_MANI_NUDE = 5
+SOGLIA_CURA = 0.4      # Sotto il 40% degli HP il giocatore usa una cura, se ce l'ha
+DADO_INIZIATIVA = 20
+
+def miglior_arma(player: Player) -> Item | None:
+    armi = player._inventario.pile("Attacco")
+    return max(armi, key=lambda pila: pila[0].valore)[0] if armi else None
+
+def prima_cura(player: Player) -> Item | None:
+    cure = player._inventario.pile("Cura")
+    return cure[0][0] if cure else None
+
+def bonus_iniziativa(combattente) -> int:
+    """Mostri: furtività e intelligenza. Giocatori: moralità e oggetti Utility"""
+    if isinstance(combattente, Mostro):
+        return (combattente.furtivita + combattente.intelligenza) // 2
+    utility = combattente._inventario.conta_categoria("Utility")
+    return combattente.moralita // 2 + 2 * utility
+
+# ==========================================
+# 2. ESITO
+# ==========================================
+
+class EsitoCombattimento:
+    def __init__(self, vincitore: str, turni: int, danni_inflitti: int, danni_subiti: int, cure_usate: int, registro: List[str]):
+        self.vincitore = vincitore   # "giocatori", "mostri" oppure "pareggio" (limite di turni)
+        self.turni = turni
+        self.danni_inflitti = danni_inflitti
+        self.danni_subiti = danni_subiti
+        self.cure_usate = cure_usate
+        self.registro = registro
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "vincitore": self.vincitore,
+            "turni": self.turni,
+            "danni_inflitti": self.danni_inflitti,
+            "danni_subiti": self.danni_subiti,
+            "cure_usate": self.cure_usate,
+        }
+
+    def __repr__(self):
+        return f"EsitoCombattimento({self.vincitore}, turni={self.turni})"
+
+# ==========================================
+# 3. RISOLUTORE A TURNI
+# ==========================================
+
+class Combattimento:
+    """
+    Scontro tra i giocatori del party e un gruppo di mostri.
+    Ogni turno tutti i combattenti vivi agiscono in ordine di iniziativa (d20 + bonus, a parità
+    prima i giocatori): i giocatori si curano se sono messi male, altrimenti colpiscono il mostro
+    più debole con l'arma migliore; i mostri usano il proprio attacca() sul giocatore scelto.
+    """
+    def __init__(self, giocatori: List[Player], mostri: List[Mostro], seed: int | None = None,
+                 rng: random.Random | None = None, max_turni: int = 200, registra: bool = False,
+                 bus: BusEventi | None = None, storico: StoricoStati | None = None):
+        self.giocatori = giocatori
+        self.mostri = mostri
+        self.rng = rng or random.Random(seed)
+        self.max_turni = max_turni
+        self.registra = registra
+        self.bus = bus # Se c'è, l'esito viene pubblicato come CombattimentoFinito
+        self.storico = storico # Se c'è, un checkpoint dei giocatori all'inizio di ogni turno (annullabile)
+        self.turno_corrente = 0
+        self.danni_inflitti = 0
+        self.danni_subiti = 0
+        self.cure_usate = 0
+        self.registro: List[str] = []
+
+    def _log(self, messaggio: str):
+        if self.registra: self.registro.append(f"[{self.turno_corrente}] {messaggio}")
+
+    def giocatori_vivi(self) -> List[Player]:
+        return [p for p in self.giocatori if p.hp > 0]
+
+    def mostri_vivi(self) -> List[Mostro]:
+        return [m for m in self.mostri if m.is_alive()]
+
+    def finito(self) -> bool:
+        return not self.giocatori_vivi() or not self.mostri_vivi()
+
+    def ordine_di_turno(self) -> list:
+        tiri = []
+        for i, c in enumerate(self.giocatori_vivi() + self.mostri_vivi()):
+            priorita = 0 if isinstance(c, Mostro) else 1
+            tiri.append((self.rng.randint(1, DADO_INIZIATIVA) + bonus_iniziativa(c), priorita, -i, c))
+        tiri.sort(key=lambda t: t[:3], reverse=True)
+        return [t[3] for t in tiri]
+
+    # ---------- AZIONI ----------
+    def _azione_giocatore(self, player: Player):
+        cura = prima_cura(player)
+        if cura and player.hp <= player.max_hp * SOGLIA_CURA:
+            player.usa_item(cura.nome) # La cura si consuma
+            self.cure_usate += 1
+            self._log(f"{player.nome} usa {cura.nome} (+{cura.valore} HP)")
+            return
+
+        bersaglio = min(self.mostri_vivi(), key=lambda m: m.hp)
+        arma = miglior_arma(player)
+        danno = arma.valore if arma else DANNO_A_MANI_NUDE
+        hp_prima = bersaglio.hp
+        bersaglio.take_damage(danno)
+        self.danni_inflitti += hp_prima - bersaglio.hp
+        self._log(f"{player.nome} colpisce {bersaglio.nome} per {danno}")
+
+    def _azione_mostro(self, mostro: Mostro):
+        vivi = self.giocatori_vivi()
+        # I mostri più intelligenti infieriscono sul giocatore più debole, gli altri colpiscono a caso
+        bersaglio = min(vivi, key=lambda p: p.hp) if mostro.intelligenza >= 5 else self.rng.choice(vivi)
+        hp_prima = bersaglio.hp
+        mostro.attacca(bersaglio)
+        self.danni_subiti += hp_prima - bersaglio.hp
+        self._log(f"{mostro.nome} attacca {bersaglio.nome} ({bersaglio.hp} HP)")
+
+    def turno(self) -> bool:
+        """Risolve un turno completo; ritorna False quando lo scontro è finito"""
+        if self.finito() or self.turno_corrente >= self.max_turni: return False
+        self.turno_corrente += 1
+        if self.storico is not None: self.storico.salva(self.giocatori)
+        with ExitStack() as transazioni: # Ogni giocatore notifica una volta sola per turno (HUD, autosave)
+            for p in self.giocatori: transazioni.enter_context(p.batch())
+            for combattente in self.ordine_di_turno():
+                if self.finito(): break
+                if isinstance(combattente, Mostro):
+                    if combattente.is_alive(): self._azione_mostro(combattente)
+                elif combattente.hp > 0:
+                    self._azione_giocatore(combattente)
+        return not self.finito()
+
+    def risolvi(self) -> EsitoCombattimento:
+        while self.turno():
+            pass
+        if not self.mostri_vivi(): vincitore = "giocatori"
+        elif not self.giocatori_vivi(): vincitore = "mostri"
+        else: vincitore = "pareggio"
+        self._log(f"Fine: vincono {vincitore}")
+        esito = EsitoCombattimento(vincitore, self.turno_corrente, self.danni_inflitti, self.danni_subiti, self.cure_usate, self.registro)
+        if self.bus is not None: self.bus.pubblica(CombattimentoFinito(esito))
+        return esito
+
+# ==========================================
+# 4. SCORCIATOIE
+# ==========================================
+
+def mostri_dai_creator(creators: List[MostroCreator]) -> List[Mostro]:
+    return [creator.crea_mostro() for creator in creators]
+
+def combatti(giocatori: List[Player], creators: List[MostroCreator], seed: int | None = None, **opzioni) -> EsitoCombattimento:
+    """Un incontro completo: i mostri escono dalle factory, il party è quello del GameManager"""
+    return Combattimento(giocatori, mostri_dai_creator(creators), seed=seed, **opzioni).risolvi()
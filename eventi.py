@@ -0,0 +1,168 @@
+from __future__ import annotations
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Hashable, List
+
+# ==========================================
+# 1. EVENTI
+# ==========================================
+# La logica (Player, GameManager, combattimento) pubblica, la GUI si iscrive per argomento:
+# nessuno dei due conosce l'altro, e gli eventi arrivano tutti insieme una volta per frame.
+
+class Evento:
+    argomento = "*"
+
+    def chiave(self) -> Hashable | None:
+        """Eventi con la stessa chiave si possono accorpare mentre sono in coda (None = mai)"""
+        return None
+
+    def accorpa(self, nuovo: Evento) -> None:
+        pass
+
+class CampoCambiato(Evento):
+    """Un campo di un soggetto osservato è cambiato (hp, moralita...)"""
+    def __init__(self, soggetto, vecchio: Any = None, nuovo: Any = None):
+        self.soggetto = soggetto
+        self.vecchio = vecchio
+        self.nuovo = nuovo
+
+    def chiave(self):
+        return (self.argomento, id(self.soggetto))
+
+    def accorpa(self, nuovo: CampoCambiato) -> None:
+        self.nuovo = nuovo.nuovo # Resta il valore di partenza, arriva quello finale
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.vecchio!r} -> {self.nuovo!r})"
+
+class HpCambiati(CampoCambiato):
+    argomento = "hp"
+
+class MoralitaCambiata(CampoCambiato):
+    argomento = "moralita"
+
+class InventarioCambiato(CampoCambiato):
+    argomento = "inventario"
+
+class GiocatoriCambiati(Evento):
+    """Il GameManager ha aggiunto, caricato o azzerato i giocatori"""
+    argomento = "giocatori"
+
+    def __init__(self, giocatori: list):
+        self.giocatori = giocatori
+
+    def chiave(self):
+        return self.argomento
+
+class CombattimentoFinito(Evento):
+    argomento = "combattimento"
+
+    def __init__(self, esito):
+        self.esito = esito
+
+# Campo del Subject -> evento da pubblicare
+EVENTI_CAMPI: Dict[str, type] = {
+    "hp": HpCambiati,
+    "moralita": MoralitaCambiata,
+    "inventario": InventarioCambiato,
+}
+
+# ==========================================
+# 2. BUS CON CODA SINCRONIZZATA AL FRAME
+# ==========================================
+
+ACCODA = "accoda"     # Ogni evento arriva (finché la coda ha posto)
+ACCORPA = "accorpa"   # Un solo evento in coda per chiave: i successivi si fondono nel primo
+SCARTA = "scarta"     # Eventi sacrificabili: scartati quando la coda è quasi piena
+
+class BusEventi:
+    """
+    pubblica() mette l'evento in una coda limitata (sicura tra thread); distribuisci(), chiamata
+    dal loop principale una volta per frame, consegna tutto agli iscritti dell'argomento.
+    Gli eventi pubblicati durante la distribuzione arrivano al frame successivo. Se un argomento
+    non ha iscritti, pubblicare non costa nulla (es. simulazioni e partite headless).
+    """
+    def __init__(self, capacita: int = 1024, soglia_scarto: float = 0.75):
+        self.capacita = capacita
+        self.soglia_scarto = int(capacita * soglia_scarto)
+        self._coda: deque = deque()
+        self._in_coda: Dict[Hashable, Evento] = {} # chiave -> evento accorpabile ancora in coda
+        self._iscritti: Dict[str, List[Callable[[Evento], None]]] = {}
+        self._politiche: Dict[str, str] = {"hp": ACCORPA, "moralita": ACCORPA, "inventario": ACCORPA, "giocatori": ACCORPA}
+        self._lock = threading.Lock()
+        # Contatori
+        self.pubblicati = 0
+        self.accorpati = 0
+        self.scartati = 0
+        self.distribuiti = 0
+
+    def __len__(self):
+        return len(self._coda)
+
+    def imposta_politica(self, argomento: str, politica: str) -> None:
+        if politica not in (ACCODA, ACCORPA, SCARTA): raise ValueError(f"Politica sconosciuta: {politica}")
+        self._politiche[argomento] = politica
+
+    # ---------- ISCRIZIONI ----------
+    def iscrivi(self, argomento: str, callback: Callable[[Evento], None]) -> Callable[[Evento], None]:
+        """argomento "*" riceve tutti gli eventi"""
+        self._iscritti.setdefault(argomento, []).append(callback)
+        return callback
+
+    def disiscrivi(self, argomento: str, callback: Callable[[Evento], None]) -> None:
+        iscritti = self._iscritti.get(argomento)
+        if iscritti and callback in iscritti:
+            iscritti.remove(callback)
+            if not iscritti: del self._iscritti[argomento]
+
+    def ha_iscritti(self, argomento: str) -> bool:
+        return argomento in self._iscritti or "*" in self._iscritti
+
+    # ---------- PUBBLICAZIONE ----------
+    def pubblica(self, evento: Evento) -> bool:
+        """Ritorna False se l'evento non è entrato in coda (nessun iscritto o coda piena)"""
+        argomento = evento.argomento
+        if not self.ha_iscritti(argomento): return False
+        politica = self._politiche.get(argomento, ACCODA)
+        with self._lock:
+            self.pubblicati += 1
+            if politica == ACCORPA:
+                chiave = evento.chiave()
+                precedente = self._in_coda.get(chiave)
+                if precedente is not None:
+                    precedente.accorpa(evento)
+                    self.accorpati += 1
+                    return True
+            limite = self.soglia_scarto if politica == SCARTA else self.capacita
+            if len(self._coda) >= limite:
+                self.scartati += 1
+                return False
+            self._coda.append(evento)
+            if politica == ACCORPA: self._in_coda[chiave] = evento
+            return True
+
+    def pubblica_cambiamenti(self, soggetto, cambiamenti) -> None:
+        """Da un Subject: ogni Cambiamento di un campo noto diventa l'evento corrispondente"""
+        for c in cambiamenti:
+            classe = EVENTI_CAMPI.get(c.campo)
+            if classe is not None: self.pubblica(classe(soggetto, c.vecchio, c.nuovo))
+
+    # ---------- DISTRIBUZIONE ----------
+    def distribuisci(self) -> int:
+        """Da chiamare una volta per frame: consegna gli eventi in coda e ritorna quanti erano"""
+        with self._lock:
+            if not self._coda: return 0
+            coda, self._coda = self._coda, deque()
+            self._in_coda = {}
+        for evento in coda:
+            for callback in tuple(self._iscritti.get(evento.argomento, ())) + tuple(self._iscritti.get("*", ())):
+                callback(evento)
+        self.distribuiti += len(coda)
+        return len(coda)
+
+    def svuota(self) -> None:
+        with self._lock:
+            self._coda.clear()
+            self._in_coda = {}
+
+bus_eventi = BusEventi()
@@ -0,0 +1,108 @@
+import argparse
+import contextlib
+import io
+import random
+import tempfile
+import time
+from typing import List
+
+from LogicaGioco import GameManager, GameFacade, AutoSaveObserver, GestoreSlot, RegistroSessioni
+from motore import MotoreGioco, EventoInput, Click, Tasto, Esci, INTRO_FRASI, LIVELLO0_FRASI
+
+# ==========================================
+# RUNNER SENZA FINESTRA
+# ==========================================
+# Fa girare MotoreGioco senza pygame: un bot genera gli input, il motore li consuma.
+# Uso: python headless.py --partite 1000 [--salva] [--seed 1] [--sessioni 50]
+
+MORALITA = ["btn_eroe", "btn_mercenario", "btn_indifferente"]
+
+def partita_scriptata(motore: MotoreGioco, nomi=("Ada", "Bob"), rng: random.Random | None = None) -> List[List[EventoInput]]:
+    """Frame di input (uno per passo) per andare dal MENU al GAMEPLAY creando due giocatori"""
+    rng = rng or random.Random(0)
+    frame = [[Click(*motore.btn_start.center)], [Click(*motore.btn_nuovo.center)]]
+    frame += [[Click(0, 0)] for _ in INTRO_FRASI]
+    frame += [[Click(0, 0)] for _ in LIVELLO0_FRASI]
+    for nome in nomi:
+        frame.append([Tasto(carattere=c) for c in nome] + [Tasto("INVIO")])
+        frame.append([Click(*getattr(motore, rng.choice(MORALITA)).center)])
+    frame.append([Click(0, 0)]) # MAPPA_MONDI -> GAMEPLAY
+    # Un po' di gioco con gli inventari
+    for _ in range(rng.randint(0, 6)):
+        frame.append([Click(*rng.choice([motore.rect_btn_p1, motore.rect_btn_p2]).center)])
+    return frame
+
+def _nuova_partita(manager: GameManager, facade: GameFacade, gestore_slot: GestoreSlot | None, rng: random.Random):
+    manager.resetGameData()
+    motore = MotoreGioco(facade, gestore_slot)
+    return motore, iter(partita_scriptata(motore, rng=rng) + [[Esci()]])
+
+def gioca(partite: int, salva: bool = False, seed: int = 0, verboso: bool = False, sessioni: int = 1) -> dict:
+    """
+    sessioni=1: le partite una dopo l'altra sul GameManager globale.
+    sessioni>1: altrettante partite contemporanee nello stesso processo, ognuna nella sua
+    sessione del RegistroSessioni; a ogni giro ogni partita avanza di un passo.
+    """
+    rng = random.Random(seed)
+    cartella = tempfile.TemporaryDirectory() if salva else None
+    registro = RegistroSessioni(cartella.name if cartella else None) if sessioni > 1 else None
+
+    passi, completate = 0, 0
+    uscita = io.StringIO() if not verboso else None
+    inizio = time.perf_counter()
+    with contextlib.redirect_stdout(uscita) if uscita else contextlib.nullcontext():
+        if registro is not None:
+            tavoli = [(s.manager, s.facade, s.gestore_slot) for s in (registro.crea() for _ in range(min(sessioni, partite)))]
+        else:
+            manager = GameManager.get_instance()
+            gestore_slot = GestoreSlot(cartella.name, legacy=None) if salva else None
+            auto_saver = AutoSaveObserver(gestore_slot.percorso(gestore_slot.nuovo_nome())) if salva else None
+            if auto_saver: auto_saver.ascoltatori.append(gestore_slot.registra_salvataggio)
+            tavoli = [(manager, GameFacade(manager, auto_saver), gestore_slot)]
+
+        in_corso = [[tavolo, *_nuova_partita(*tavolo, rng)] for tavolo in tavoli]
+        da_iniziare = partite - len(in_corso)
+        while in_corso:
+            for voce in list(in_corso):
+                tavolo, motore, frame = voce
+                eventi = next(frame, None)
+                if eventi is not None:
+                    motore.passo(eventi)
+                    continue
+                # Partita finita: si conta e, se ne restano, il tavolo ne comincia un'altra
+                passi += motore.passi
+                completate += motore.stato == "GAMEPLAY" and len(tavolo[0].giocatori) == 2
+                if da_iniziare:
+                    voce[1:] = _nuova_partita(*tavolo, rng)
+                    da_iniziare -= 1
+                else:
+                    in_corso.remove(voce)
+            if uscita: uscita.seek(0); uscita.truncate()
+        if registro is not None: registro.chiudi_tutte()
+        elif tavoli[0][1].auto_saver: tavoli[0][1].auto_saver.chiudi()
+    durata = time.perf_counter() - inizio
+    if cartella: cartella.cleanup()
+
+    return {
+        "partite": partite,
+        "sessioni": len(tavoli),
+        "completate": completate,
+        "passi": passi,
+        "secondi": round(durata, 4),
+        "passi_al_secondo": round(passi / durata) if durata > 0 else 0,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Esegue partite scriptate senza finestra e misura il costo della logica")
+    parser.add_argument("--partite", type=int, default=1000)
+    parser.add_argument("--salva", action="store_true", help="Attiva l'autosave (in una cartella temporanea)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verboso", action="store_true", help="Mostra i log del gioco")
+    parser.add_argument("--sessioni", type=int, default=1, help="Partite contemporanee nello stesso processo")
+    args = parser.parse_args()
+
+    risultato = gioca(args.partite, args.salva, args.seed, args.verboso, args.sessioni)
+    for chiave, valore in risultato.items():
+        print(f"{chiave}: {valore}")
+    if risultato["completate"] != risultato["partite"]:
+        raise SystemExit(1)
@@ -1,7 +1,16 @@
 import pygame
+import threading
+from collections import OrderedDict
+from asset import CacheScalature
 
 class GestoreLivelli:
-    def __init__(self, larghezza, altezza):
+    """
+    Sfondi dei livelli caricati solo quando servono.
+    L'originale di un livello viene decodificato al primo accesso e scalato una volta sola
+    per ogni dimensione della finestra; in memoria restano al massimo `capacita` livelli
+    (quello attuale e il successivo), che viene preparato in anticipo da un thread in background.
+    """
+    def __init__(self, larghezza, altezza, capacita: int = 2, prefetch: bool = True):
         # Percorsi delle tue immagini sequenziali
         self.percorsi = [
             'livello_1.jpeg',
@@ -10,34 +19,97 @@ class GestoreLivelli:
             'livello_4.jpeg',
             'livello_5.jpeg'
         ]
-        
-        # Carichiamo i "Master" (originali)
-        self.master_images = []
-        for p in self.percorsi:
-            try:
-                img = pygame.image.load(p).convert()
-                self.master_images.append(img)
-            except:
-                # Fallback se l'immagine manca (rettangolo blu)
-                fallback = pygame.Surface((800, 600))
-                fallback.fill((0, 0, 100))
-                self.master_images.append(fallback)
-        
-        # Sfondi pronti per il disegno (scalati)
-        self.sfondi_scalati = []
-        self.ridimensiona_tutto(larghezza, altezza)
-        
-        self.indice_corrente = 0
+        self.capacita = capacita
+        self.prefetch = prefetch
+        self.dimensione = (larghezza, altezza)
 
+        # indice -> master; le versioni scalate stanno in _scalate, chiave (indice, dimensione)
+        self._cache: OrderedDict = OrderedDict()
+        self._scalate = CacheScalature(capacita * 3)
+        # indice -> superficie decodificata dal thread (ancora da convertire nel thread principale)
+        self._precaricati = {}
+        self._in_corso = set()
+        self._lock = threading.Lock()
+        # Contatori
+        self.caricamenti = 0
+
+        self._indice = 0
+
+    @property
+    def indice_corrente(self):
+        return self._indice
+
+    @indice_corrente.setter
+    def indice_corrente(self, indice):
+        if indice != self._indice:
+            self._indice = indice
+            with self._lock: # Precaricati rimasti indietro (es. dopo il caricamento di uno slot)
+                for i in [i for i in self._precaricati if i not in (indice, indice + 1)]:
+                    del self._precaricati[i]
+        # Appena si entra in un livello, il successivo diventa probabile: lo prepariamo (se non è già pronto)
+        if self.prefetch: self.precarica(indice + 1)
+
+    def __len__(self):
+        return len(self.percorsi)
+
+    @property
+    def scalature(self):
+        return self._scalate.miss
+
+    # ---------- CARICAMENTO ----------
+    def _decodifica(self, indice):
+        try:
+            return pygame.image.load(self.percorsi[indice])
+        except:
+            # Fallback se l'immagine manca (rettangolo blu)
+            fallback = pygame.Surface((800, 600))
+            fallback.fill((0, 0, 100))
+            return fallback
+
+    def _prepara_in_background(self, indice):
+        img = self._decodifica(indice) # Lettura del file + decodifica JPEG: la parte lenta
+        with self._lock:
+            self._precaricati[indice] = img
+            self._in_corso.discard(indice)
+
+    def precarica(self, indice):
+        """Avvia la decodifica del livello in un thread (se esiste e non è già pronto)"""
+        if not 0 <= indice < len(self.percorsi): return
+        with self._lock:
+            if indice in self._cache or indice in self._precaricati or indice in self._in_corso: return
+            self._in_corso.add(indice)
+        threading.Thread(target=self._prepara_in_background, args=(indice,), daemon=True, name="PrecaricaLivello").start()
+
+    def _master(self, indice):
+        with self._lock:
+            img = self._precaricati.pop(indice, None)
+        if img is None:
+            img = self._decodifica(indice) # Non ancora pronto in background: lo carichiamo subito
+        self.caricamenti += 1
+        # convert() tocca il display: va fatto nel thread principale
+        return img.convert() if pygame.display.get_surface() else img
+
+    def get_livello(self, indice):
+        master = self._cache.get(indice)
+        if master is None:
+            master = self._master(indice)
+        self._cache[indice] = master
+        self._cache.move_to_end(indice)
+        while len(self._cache) > self.capacita:
+            vecchio, _ = self._cache.popitem(last=False) # Fuori il livello usato meno di recente
+            self._scalate.dimentica(vecchio)
+        return self._scalate.scala(indice, master, self.dimensione)
+
+    # ---------- API ----------
     def ridimensiona_tutto(self, L, A):
-        """Richiamata quando la finestra cambia dimensione"""
-        self.sfondi_scalati = [pygame.transform.scale(img, (L, A)) for img in self.master_images]
+        """Richiamata quando la finestra cambia dimensione: si riscala solo al prossimo accesso"""
+        self.dimensione = (L, A)
 
     def get_livello_attuale(self):
-        return self.sfondi_scalati[self.indice_corrente]
+        return self.get_livello(self._indice)
 
     def prossimo_livello(self):
-        if self.indice_corrente < len(self.sfondi_scalati) - 1:
-            self.indice_corrente += 1
+        if self._indice < len(self.percorsi) - 1:
+            self.indice_corrente = self._indice + 1
             return True
-        return False # Gioco finito
\ No newline at end of file
+        return False # Gioco finito
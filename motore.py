@@ -0,0 +1,390 @@
+from __future__ import annotations
+from typing import List, Dict, Any
+from LogicaGioco import (GameFacade, GestoreSlot, catalogo_oggetti, Player1Creator, Player2Creator,
+                         valida_nome, assegna_moralita)
+
+# ==========================================
+# 1. EVENTI DI INPUT ASTRATTI
+# ==========================================
+# Il motore non conosce pygame: la GUI (o un bot/test) traduce i suoi eventi in questi.
+
+class EventoInput:
+    pass
+
+class Click(EventoInput):
+    def __init__(self, x: int, y: int):
+        self.pos = (x, y)
+
+    def __repr__(self): return f"Click{self.pos}"
+
+class Tasto(EventoInput):
+    """tasto: "INVIO", "BACKSPACE" oppure "" per un carattere normale (in carattere)"""
+    def __init__(self, tasto: str = "", carattere: str = ""):
+        self.tasto = tasto
+        self.carattere = carattere
+
+    def __repr__(self): return f"Tasto({self.tasto or self.carattere!r})"
+
+class Ridimensiona(EventoInput):
+    def __init__(self, w: int, h: int):
+        self.w = w
+        self.h = h
+
+class Esci(EventoInput):
+    pass
+
+# ==========================================
+# 2. RETTANGOLO (senza pygame)
+# ==========================================
+
+class Rettangolo:
+    """
+    Rettangolo minimale con la stessa interfaccia di pygame.Rect per ciò che serve al gioco.
+    Si comporta anche come sequenza (x, y, w, h), quindi pygame lo accetta direttamente nei draw.
+    """
+    def __init__(self, x: int, y: int, w: int, h: int):
+        self.x, self.y, self.w, self.h = x, y, w, h
+
+    @property
+    def width(self): return self.w
+    @property
+    def height(self): return self.h
+    @property
+    def left(self): return self.x
+    @property
+    def top(self): return self.y
+    @property
+    def right(self): return self.x + self.w
+    @property
+    def bottom(self): return self.y + self.h
+    @property
+    def centerx(self): return self.x + self.w // 2
+    @property
+    def centery(self): return self.y + self.h // 2
+    @property
+    def center(self): return (self.centerx, self.centery)
+
+    @property
+    def topleft(self): return (self.x, self.y)
+    @topleft.setter
+    def topleft(self, pos): self.x, self.y = pos
+
+    def collidepoint(self, *pos) -> bool:
+        px, py = pos[0] if len(pos) == 1 else pos
+        return self.x <= px < self.x + self.w and self.y <= py < self.y + self.h
+
+    def __len__(self): return 4
+    def __getitem__(self, i): return (self.x, self.y, self.w, self.h)[i]
+    def __eq__(self, altro): return tuple(self) == tuple(altro)
+    def __repr__(self): return f"Rettangolo({self.x}, {self.y}, {self.w}, {self.h})"
+
+def frecce_selettore(rect: Rettangolo, w_arrow: int = 30):
+    """Posizioni delle frecce < > di un selettore, relative al rettangolo principale"""
+    return (Rettangolo(rect.right - 200, rect.y, w_arrow, rect.height),
+            Rettangolo(rect.right - 40, rect.y, w_arrow, rect.height))
+
+# ==========================================
+# 3. TESTI
+# ==========================================
+
+INTRO_FRASI = [
+    ["Ti svegli, confuso…", "Che strano sogno! Meglio alzarsi"],
+    ["C'era una cosa che volevi fare, ma cosa?"],
+    ["Ah, certo! Provare il nuovo gioco!"],
+    ["Lo prendi in mano e… starnutisci!", "È impolverato, meglio pulirlo prima."],
+    ["Prendi un panno, lo pulisci e lo inserisci nel lettore…", "L’oscurità ti avvolge…"]
+]
+
+LIVELLO0_FRASI = [
+    [],
+    ["Apri gli occhi… tutto è nero.", "Un senso di disagio ti avvolge."],
+    ["Davanti a te c'è un ragazzo… ma dove siete?"],
+    ["Ti avvicini, provi a parlargli… nulla.", "Sembra perso quanto te."],
+    ["All’improvviso, nel buio… una scritta appare!"],
+    [
+        "_Benvenuti nella vostra nuova avventura!_",
+        "_D'ora in poi collaborerete per vincere._",
+        "_Se non lo farete, rimarrete qui per sempre._"
+    ],
+    ["_Inserite i vostri nomi_"]
+]
+
+CATEGORIE = ["Attacco", "Cura", "Utility"]
+OPZIONI_VIDEO = ["FINESTRA", "FULLSCREEN"]
+MAX_SLOT_VISIBILI = 5
+
+# ==========================================
+# 4. MACCHINA A STATI DEL GIOCO
+# ==========================================
+
+class MotoreGioco:
+    """
+    Tutto lo stato della partita (schermata, dialoghi, nomi, inventari aperti...) e le regole
+    con cui cambia in risposta agli input. Non usa pygame: la GUI è solo un adattatore che
+    traduce gli eventi, chiama passo() e disegna lo stato; un runner headless può fare lo stesso
+    senza finestra.
+    passo() restituisce gli "effetti" che l'adattatore deve applicare fuori dalla logica:
+    "sincronizza_hud", "modalita_schermo", "ridimensiona".
+    """
+    def __init__(self, facade: GameFacade, gestore_slot: GestoreSlot | None = None, larghezza: int = 800, altezza: int = 600):
+        self.facade = facade
+        self.manager = facade.manager
+        self.gestore_slot = gestore_slot
+
+        self.stato = "MENU"
+        self.running = True
+        self.player_corrente = 1
+        self.nome_inserito = ""
+        self.input_nome_attivo = False
+        self.indice_lettura = 0
+        self.indice_livello = 0
+        self.modalita_schermo = 0
+        # Inventari dell'HUD
+        self.inv_p1_aperto = False
+        self.inv_p2_aperto = False
+        self.idx_cat_p1 = 0
+        self.idx_cat_p2 = 0
+
+        self.passi = 0
+        self._effetti: List[str] = []
+
+        larghezza_btn, altezza_btn = 200, 45
+        self.btn_start = Rettangolo(0, 0, larghezza_btn, altezza_btn)
+        self.btn_settings = Rettangolo(0, 0, larghezza_btn, altezza_btn)
+        self.btn_exit = Rettangolo(0, 0, larghezza_btn, altezza_btn)
+        self.btn_nuovo = Rettangolo(0, 0, larghezza_btn, altezza_btn)
+        self.btn_carica = Rettangolo(0, 0, larghezza_btn, altezza_btn)
+        self.btn_eroe = Rettangolo(0, 0, 180, 50)
+        self.btn_mercenario = Rettangolo(0, 0, 180, 50)
+        self.btn_indifferente = Rettangolo(0, 0, 180, 50)
+        self.btn_reset_data = Rettangolo(0, 0, larghezza_btn, altezza_btn)
+        self.btn_back_menu = Rettangolo(0, 0, larghezza_btn, altezza_btn)
+        self.btn_indietro_slot = Rettangolo(0, 0, larghezza_btn, altezza_btn)
+        # I bottoni quadrati per aprire gli inventari dei singoli player
+        self.rect_btn_p1 = Rettangolo(230, 15, 35, 35)
+        self.rect_btn_p2 = Rettangolo(larghezza - 265, 15, 35, 35)
+        self.rect_schermo = Rettangolo(0, 0, 600, 50)
+        self.ridimensiona(larghezza, altezza)
+
+    # ---------- LAYOUT ----------
+    def ridimensiona(self, w: int, h: int):
+        self.larghezza, self.altezza = w, h
+        x_c = (w - self.btn_start.w) // 2
+        self.btn_start.topleft = (x_c, h - 250)
+        self.btn_settings.topleft = (x_c, h - 185)
+        self.btn_exit.topleft = (x_c, h - 120)
+        self.btn_nuovo.topleft = (x_c, h - 220)
+        self.btn_carica.topleft = (x_c, h - 155)
+
+        centro_x = w // 2
+        self.btn_eroe.topleft = (centro_x - 290, h // 2)
+        self.btn_mercenario.topleft = (centro_x - 90, h // 2)
+        self.btn_indifferente.topleft = (centro_x + 110, h // 2)
+
+        # Settings
+        self.btn_reset_data.topleft = (x_c, h // 2 + 10)
+        self.btn_back_menu.topleft = (x_c, h // 2 + 80)
+        self.btn_indietro_slot.topleft = (x_c, h - 80)
+        self.rect_schermo.topleft = ((w - self.rect_schermo.w) // 2, h // 2 - 60)
+        self.freccia_sx, self.freccia_dx = frecce_selettore(self.rect_schermo)
+
+        # Il tasto P1 rimane ancorato a sinistra, il tasto P2 al bordo destro
+        self.rect_btn_p1.topleft = (230, 15)
+        self.rect_btn_p2.topleft = (w - 265, 15)
+
+    def rect_slot(self, i: int) -> Rettangolo:
+        """Rettangolo del bottone dell'i-esimo slot nella schermata di caricamento"""
+        return Rettangolo((self.larghezza - 560) // 2, 140 + i * 60, 560, 48)
+
+    def slot_visibili(self):
+        return self.gestore_slot.elenco()[:MAX_SLOT_VISIBILI] if self.gestore_slot else []
+
+    def frasi_correnti(self) -> List[str]:
+        if self.stato == "INTRODUZIONE": return INTRO_FRASI[self.indice_lettura]
+        if self.stato == "LIVELLO_0": return LIVELLO0_FRASI[self.indice_lettura]
+        return []
+
+    # ---------- PASSO ----------
+    def passo(self, eventi: List[EventoInput]) -> List[str]:
+        """Consuma gli eventi di un frame e restituisce gli effetti da applicare (senza doppioni)"""
+        for evento in eventi:
+            self.gestisci(evento)
+        self.passi += 1
+        effetti, self._effetti = self._effetti, []
+        return list(dict.fromkeys(effetti))
+
+    def gestisci(self, evento: EventoInput):
+        if isinstance(evento, Esci):
+            self.running = False
+        elif isinstance(evento, Ridimensiona):
+            self.ridimensiona(evento.w, evento.h)
+            self._effetti.append("ridimensiona")
+        elif isinstance(evento, Tasto):
+            self._tasto(evento)
+        elif isinstance(evento, Click):
+            self._click(evento.pos)
+
+    def _tasto(self, evento: Tasto):
+        if not self.input_nome_attivo: return # se il gioco è nella modalità in cui il giocatore sta inserendo il nome
+        if evento.tasto == "INVIO":
+            if len(self.nome_inserito) > 1:
+                self.input_nome_attivo = False
+                self.stato = "SCELTA_MORALITA"
+        elif evento.tasto == "BACKSPACE": # cancella l'ultimo carattere scritto
+            self.nome_inserito = self.nome_inserito[:-1]
+        elif len(self.nome_inserito) < 12:
+            self.nome_inserito += evento.carattere
+
+    def _click(self, pos):
+        stato = self.stato
+        if stato == "MENU": # avvia nuova partita, apri le impostazioni o esci dal gioco
+            if self.btn_start.collidepoint(pos):
+                if self.gestore_slot: self.gestore_slot.controlla_modifiche() # Slot cambiati da fuori, letti qui e non nel disegno
+                self.stato = "SCELTA"
+            elif self.btn_settings.collidepoint(pos): self.stato = "SETTINGS"
+            elif self.btn_exit.collidepoint(pos): self.running = False
+
+        elif stato == "SETTINGS":
+            cambio = -1 if self.freccia_sx.collidepoint(pos) else 1 if self.freccia_dx.collidepoint(pos) else 0
+            if cambio:
+                self.modalita_schermo = (self.modalita_schermo + cambio) % len(OPZIONI_VIDEO)
+                self._effetti.append("modalita_schermo")
+            elif self.btn_reset_data.collidepoint(pos): # cancella i salvataggi e resetta i dati del gioco
+                self.facade.cancella_salvataggio() # Snapshot e journal (scartando le scritture in sospeso)
+                if self.gestore_slot: self.gestore_slot.cancella_tutti()
+                self.manager.resetGameData()
+                self.facade.storico.svuota()
+                print("Log: Reset eseguito.")
+            elif self.btn_back_menu.collidepoint(pos):
+                self.stato = "MENU"
+
+        elif stato == "SCELTA":
+            if self.btn_nuovo.collidepoint(pos):
+                if self.gestore_slot: self.facade.usa_percorso(self.gestore_slot.percorso(self.gestore_slot.nuovo_nome())) # La nuova partita va in uno slot nuovo
+                self.stato, self.indice_lettura = "INTRODUZIONE", 0
+            elif self.btn_carica.collidepoint(pos) and self.gestore_slot and self.gestore_slot.ha_slot():
+                self.stato = "CARICA_SLOT"
+
+        elif stato == "CARICA_SLOT":
+            slot_scelto = None
+            for i, info in enumerate(self.slot_visibili()):
+                if self.rect_slot(i).collidepoint(pos): slot_scelto = info
+            if self.btn_indietro_slot.collidepoint(pos):
+                self.stato = "SCELTA"
+            elif slot_scelto:
+                self.carica_slot(slot_scelto.nome)
+
+        elif stato == "INTRODUZIONE":
+            self.indice_lettura += 1
+            if self.indice_lettura >= len(INTRO_FRASI):
+                self.stato, self.indice_lettura = "LIVELLO_0", 0
+
+        elif stato == "LIVELLO_0":
+            if self.indice_lettura == len(LIVELLO0_FRASI) - 1:
+                self.input_nome_attivo = True
+            else:
+                self.indice_lettura += 1
+
+        elif stato == "SCELTA_MORALITA":
+            scelta = None
+            if self.btn_eroe.collidepoint(pos): scelta = "eroe altruista"
+            elif self.btn_mercenario.collidepoint(pos): scelta = "mercenario egoista"
+            elif self.btn_indifferente.collidepoint(pos): scelta = "anima indifferente"
+            if scelta: self._crea_personaggio(scelta)
+
+        elif stato == "MAPPA_MONDI":
+            self.stato = "GAMEPLAY"
+            self.indice_livello = 0
+            if self.facade.auto_saver: self.facade.auto_saver.flush(attendi=False) # Cambio livello: salva senza aspettare il debounce
+            self.idx_cat_p1 = 0 # Reset
+            self.idx_cat_p2 = 0 # Reset
+            self._effetti.append("sincronizza_hud")
+
+        elif stato == "GAMEPLAY":
+            self._click_inventari(pos)
+
+    def _crea_personaggio(self, scelta: str):
+        creator = Player1Creator() if self.player_corrente == 1 else Player2Creator()
+
+        # 1. CREA IL PERSONAGGIO
+        nome = valida_nome(self.nome_inserito, self.player_corrente)
+        p = creator.create_character(nome, 0)
+
+        # 2. AGGIUNGI L'ITEM SUBITO (Prima di salvarlo!)
+        p._inventario.add_item(catalogo_oggetti.per_nome("Spada"))
+
+        # 3. AGGIUNGI AL MANAGER E COLLEGA L'OSSERVATORE
+        # Questo è fondamentale affinché l'AutoSave veda il player nella lista
+        self.manager.aggiungi_giocatore(p)
+        if self.facade.auto_saver: p.attach(self.facade.auto_saver)
+
+        # 4. ASSEGNA MORALITA (Questo triggera il salvataggio)
+        assegna_moralita(p, scelta)
+
+        # 5. AGGIORNA LA GRAFICA
+        self._effetti.append("sincronizza_hud")
+
+        if self.player_corrente == 1:
+            self.player_corrente = 2
+            self.nome_inserito = ""
+            self.stato = "LIVELLO_0"
+            self.input_nome_attivo = True
+            self.indice_lettura = 6
+        else:
+            self.stato = "MAPPA_MONDI"
+            self.input_nome_attivo = False
+
+    def _click_inventari(self, pos):
+        x, y = pos
+        # --- PLAYER 1 ---
+        # Controlliamo prima se l'inventario è aperto per catturare il click sulle TAB (zona Y tra 30 e 55)
+        tab_p1_cliccata = False
+        if self.inv_p1_aperto and 30 < y < 55:
+            for i, (da, a) in enumerate([(225, 275), (275, 325), (325, 375)]):
+                if da < x < a:
+                    self.idx_cat_p1 = i
+                    tab_p1_cliccata = True
+                    break
+        # Se non abbiamo cliccato una TAB, allora controlliamo il pulsante INV
+        if not tab_p1_cliccata and self.rect_btn_p1.collidepoint(pos):
+            self.inv_p1_aperto = not self.inv_p1_aperto
+
+        # --- PLAYER 2 ---
+        tab_p2_cliccata = False
+        x_inv_p2 = self.larghezza - 305 # Punto di inizio X dell'inventario di P2
+        if self.inv_p2_aperto and 30 < y < 55:
+            for i, (da, a) in enumerate([(x_inv_p2 - 5, x_inv_p2 + 55), (x_inv_p2 + 55, x_inv_p2 + 105), (x_inv_p2 + 105, x_inv_p2 + 155)]):
+                if da < x < a:
+                    self.idx_cat_p2 = i
+                    tab_p2_cliccata = True
+                    break
+        # Solo se NON ho cliccato una tab, controllo se devo chiudere l'inventario
+        if not tab_p2_cliccata and self.rect_btn_p2.collidepoint(pos):
+            self.inv_p2_aperto = not self.inv_p2_aperto
+
+    # ---------- SALVATAGGI ----------
+    def carica_slot(self, nome: str) -> bool:
+        self.facade.usa_percorso(self.gestore_slot.percorso(nome))
+        if not self.facade.carica_da_disco():
+            print("Errore nel caricamento o nessun salvataggio trovato")
+            return False
+        info = self.gestore_slot.info(nome)
+        self.manager.livello_corrente = info.livello if info else 1
+        self.indice_livello = self.manager.livello_corrente - 1
+        self.stato = "GAMEPLAY"
+        self._effetti.append("sincronizza_hud")
+        return True
+
+    def istantanea(self) -> Dict[str, Any]:
+        """Lo stato osservabile del motore (per test, bot e confronti tra partite)"""
+        return {
+            "stato": self.stato,
+            "player_corrente": self.player_corrente,
+            "nome_inserito": self.nome_inserito,
+            "input_nome_attivo": self.input_nome_attivo,
+            "indice_lettura": self.indice_lettura,
+            "indice_livello": self.indice_livello,
+            "inventari_aperti": (self.inv_p1_aperto, self.inv_p2_aperto),
+            "categorie": (CATEGORIE[self.idx_cat_p1], CATEGORIE[self.idx_cat_p2]),
+            "giocatori": [(p.nome, p.hp, p.moralita) for p in self.manager.giocatori],
+        }
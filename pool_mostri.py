@@ -0,0 +1,173 @@
+from __future__ import annotations
+from array import array
+from typing import Dict, List, Iterator
+from LogicaGioco import Mostro, MostroCreator, MostroIstanza, TipoMostro, CreatorRegistro, ATTACCHI, registro_mostri
+
+try:
+    import numpy as np
+except ImportError: # Solo per le operazioni di gruppo: senza numpy si usa un ciclo Python
+    np = None
+
+# ==========================================
+# 1. VISTA SU UN MOSTRO DEL POOL
+# ==========================================
+
+class VistaMostro(Mostro):
+    """
+    Un mostro del pool visto con l'interfaccia di Mostro: non contiene dati, legge e scrive
+    le colonne del pool. attacca() è quello della classe concreta (Goblin, Yeti...).
+    """
+    __slots__ = ("_pool", "id")
+
+    def __init__(self, pool: MostroPool, id: int):
+        self._pool = pool
+        self.id = id
+
+    @property
+    def nome(self) -> str: return self._pool._tipi[self._pool.tipo[self.id]].nome
+    @property
+    def hp(self) -> int: return self._pool.hp[self.id]
+    @hp.setter
+    def hp(self, valore: int): self._pool.hp[self.id] = valore
+    @property
+    def danno(self) -> int: return self._pool.danno[self.id]
+    @danno.setter
+    def danno(self, valore: int): self._pool.danno[self.id] = valore
+    @property
+    def furtivita(self) -> int: return self._pool.furtivita[self.id]
+    @property
+    def intelligenza(self) -> int: return self._pool.intelligenza[self.id]
+
+    def attacca(self, player) -> None:
+        proto = self._pool._tipi[self._pool.tipo[self.id]]
+        if isinstance(proto, MostroIstanza): ATTACCHI[proto.tipo.attacco](self, player) # Tipo del registro
+        else: type(proto).attacca(self, player)
+
+    def __eq__(self, altro):
+        return isinstance(altro, VistaMostro) and altro._pool is self._pool and altro.id == self.id
+
+    def __hash__(self):
+        return hash((id(self._pool), self.id))
+
+    def __repr__(self):
+        return f"VistaMostro({self.id}, {self.nome}, HP={self.hp})"
+
+# ==========================================
+# 2. POOL (STRUTTURA DI ARRAY)
+# ==========================================
+
+class MostroPool:
+    """
+    Tutti i mostri di un'ondata in colonne tipizzate (array di int a 32 bit) indicizzate per id.
+    Gli id dei mostri rilasciati finiscono in una free-list e vengono riusati: le colonne
+    crescono solo quando non ci sono posti liberi. Le operazioni di gruppo (danni ad area,
+    danno totale) lavorano sull'intera colonna, con numpy se disponibile.
+    """
+    def __init__(self, capacita: int = 64):
+        self.hp = array("i", bytes(4 * capacita))
+        self.danno = array("i", bytes(4 * capacita))
+        self.furtivita = array("i", bytes(4 * capacita))
+        self.intelligenza = array("i", bytes(4 * capacita))
+        self.tipo = array("B", bytes(capacita))       # Indice in _tipi
+        self.attivo = array("B", bytes(capacita))     # 1 = posto occupato
+        self._liberi = array("i", range(capacita - 1, -1, -1)) # Pila degli id liberi
+        self._tipi: List[Mostro] = []                 # Un prototipo per tipo (nome, classe, statistiche base)
+        self._indice_tipi: Dict[object, int] = {}
+        self._attivi = 0
+
+    @property
+    def capacita(self) -> int:
+        return len(self.hp)
+
+    def __len__(self):
+        return self._attivi
+
+    def _cresci(self):
+        extra = max(1, self.capacita)
+        for colonna in (self.hp, self.danno, self.furtivita, self.intelligenza):
+            colonna.extend(array("i", bytes(4 * extra)))
+        self.tipo.extend(bytes(extra))
+        self.attivo.extend(bytes(extra))
+        self._liberi.extend(range(self.capacita - 1, self.capacita - extra - 1, -1))
+
+    def _tipo_di(self, creator: MostroCreator | str) -> int:
+        if isinstance(creator, str): creator = registro_mostri.get(creator) # id del registro dei mostri
+        if isinstance(creator, TipoMostro): chiave = creator
+        elif isinstance(creator, CreatorRegistro): chiave = creator.tipo # Stessa classe per tutti i tipi del registro
+        else: chiave = type(creator)
+        indice = self._indice_tipi.get(chiave)
+        if indice is None:
+            # Il creator viene usato una volta sola per tipo: il prototipo fornisce le statistiche base
+            indice = len(self._tipi)
+            self._tipi.append(MostroIstanza(creator) if isinstance(creator, TipoMostro) else creator.crea_mostro())
+            self._indice_tipi[chiave] = indice
+        return indice
+
+    # ---------- ALLOCAZIONE ----------
+    def crea(self, creator: MostroCreator | str) -> int:
+        """creator: un MostroCreator oppure l'id di un tipo del registro ("goblin", "yeti"...)"""
+        if not self._liberi: self._cresci()
+        id = self._liberi.pop()
+        t = self._tipo_di(creator)
+        proto = self._tipi[t]
+        self.hp[id], self.danno[id] = proto.hp, proto.danno
+        self.furtivita[id], self.intelligenza[id] = proto.furtivita, proto.intelligenza
+        self.tipo[id] = t
+        self.attivo[id] = 1
+        self._attivi += 1
+        return id
+
+    def crea_ondata(self, creator: MostroCreator | str, n: int) -> List[int]:
+        return [self.crea(creator) for _ in range(n)]
+
+    def rilascia(self, id: int) -> None:
+        if not self.attivo[id]: return
+        self.attivo[id] = 0
+        self.hp[id] = 0
+        self._liberi.append(id)
+        self._attivi -= 1
+
+    def rilascia_morti(self) -> int:
+        morti = [i for i in self.ids() if self.hp[i] <= 0]
+        for i in morti: self.rilascia(i)
+        return len(morti)
+
+    # ---------- ACCESSO ----------
+    def vista(self, id: int) -> VistaMostro:
+        if not self.attivo[id]: raise KeyError(f"Mostro {id} non presente nel pool")
+        return VistaMostro(self, id)
+
+    def ids(self) -> List[int]:
+        return [i for i, a in enumerate(self.attivo) if a]
+
+    def vivi(self) -> List[int]:
+        return [i for i in self.ids() if self.hp[i] > 0]
+
+    def __iter__(self) -> Iterator[VistaMostro]:
+        return (VistaMostro(self, i) for i in self.vivi())
+
+    # ---------- OPERAZIONI DI GRUPPO ----------
+    def danneggia_tutti(self, amount: int) -> None:
+        """Danno ad area su tutti i mostri del pool (gli HP non scendono sotto zero)"""
+        if np is not None:
+            hp = np.frombuffer(self.hp, dtype=np.int32)
+            np.maximum(hp - amount, 0, out=hp)
+            del hp # La vista va liberata subito, altrimenti la colonna non può più crescere
+            return
+        for i in range(self.capacita):
+            if self.hp[i] > 0: self.hp[i] = max(0, self.hp[i] - amount)
+
+    def danno_totale(self) -> int:
+        """Somma del danno dei mostri vivi (attacco di tutta l'ondata in un turno)"""
+        if np is not None:
+            hp = np.frombuffer(self.hp, dtype=np.int32)
+            danno = np.frombuffer(self.danno, dtype=np.int32)
+            totale = int(danno[hp > 0].sum())
+            del hp, danno
+            return totale
+        return sum(d for h, d in zip(self.hp, self.danno) if h > 0)
+
+    def memoria_per_mostro(self) -> float:
+        """Byte delle colonne diviso per i posti del pool"""
+        byte = sum(c.itemsize * len(c) for c in (self.hp, self.danno, self.furtivita, self.intelligenza, self.tipo, self.attivo))
+        return byte / self.capacita
@@ -0,0 +1,161 @@
+from __future__ import annotations
+import csv
+import json
+import math
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, List
+import pygame
+
+# ==========================================
+# 1. MISURA DEI TEMPI PER FRAME
+# ==========================================
+
+SEZIONI = ("eventi", "logica", "disegno", "sfondo", "hud", "testo", "flip")
+
+def percentile(valori: List[float], p: float) -> float:
+    """Percentile "nearest rank" di una lista già ordinata"""
+    if not valori: return 0.0
+    rango = math.ceil(p / 100 * len(valori))
+    return valori[max(0, min(len(valori), rango) - 1)]
+
+class ProfilerFrame:
+    """
+    Tempi di ogni frame divisi per sezione (eventi, logica, disegno, sfondo, hud, testo, flip...).
+    Le sezioni si possono annidare: il tempo di una sezione interna (es. il testo dentro l'HUD)
+    non viene contato anche in quella esterna, quindi la somma delle sezioni è il tempo misurato.
+    Gli ultimi `finestra` frame servono per i percentili e il grafico; la traccia completa
+    (al massimo `storico` frame) si può esportare in CSV o JSON.
+    Da spento, sezione() non misura nulla e costa quanto un nullcontext.
+    """
+    def __init__(self, finestra: int = 240, storico: int = 36000, budget_ms: float = 1000 / 60, attivo: bool = True,
+                 orologio: Callable[[], float] = time.perf_counter):
+        self.finestra = finestra
+        self.budget_ms = budget_ms
+        self.attivo = attivo
+        self.overlay = False
+        self._orologio = orologio
+        self._recenti: deque = deque(maxlen=finestra)  # (totale_ms, {sezione: ms})
+        self.traccia: deque = deque(maxlen=storico)
+        self._corrente: Dict[str, float] | None = None
+        self._inizio_frame = 0.0
+        self._pila: List[list] = []                    # [nome, inizio, tempo dei figli]
+        self._riepilogo = None
+        self.frame = 0
+        self.fuori_budget = 0
+
+    # ---------- REGISTRAZIONE ----------
+    def inizio_frame(self) -> None:
+        if not self.attivo: return
+        self._corrente = {}
+        self._pila = []
+        self._inizio_frame = self._orologio()
+
+    def fine_frame(self) -> None:
+        if self._corrente is None: return
+        totale = (self._orologio() - self._inizio_frame) * 1000
+        voce = (totale, self._corrente)
+        self._recenti.append(voce)
+        self.traccia.append(voce)
+        self._corrente = None
+        self._riepilogo = None
+        self.frame += 1
+        if totale > self.budget_ms: self.fuori_budget += 1
+
+    def sezione(self, nome: str):
+        """with profiler.sezione("hud"): ...  (fuori da un frame o da spento non misura)"""
+        if self._corrente is None: return nullcontext()
+        return self._misura(nome)
+
+    @contextmanager
+    def _misura(self, nome: str):
+        voce = [nome, self._orologio(), 0.0]
+        self._pila.append(voce)
+        try:
+            yield
+        finally:
+            durata = self._orologio() - voce[1]
+            self._pila.pop()
+            if self._corrente is not None:
+                self._corrente[nome] = self._corrente.get(nome, 0.0) + (durata - voce[2]) * 1000
+            if self._pila: self._pila[-1][2] += durata
+
+    def avvolgi(self, nome: str, funzione: Callable) -> Callable:
+        """La funzione, misurata come sezione `nome` a ogni chiamata (es. render_testo)"""
+        def misurata(*args, **kwargs):
+            if self._corrente is None: return funzione(*args, **kwargs)
+            with self._misura(nome):
+                return funzione(*args, **kwargs)
+        misurata.__wrapped__ = funzione
+        return misurata
+
+    # ---------- STATISTICHE ----------
+    def tempi(self, sezione: str | None = None) -> List[float]:
+        """Tempi in ms degli ultimi frame: totale (sezione=None) o di una sezione"""
+        if sezione is None: return [totale for totale, _ in self._recenti]
+        return [sezioni.get(sezione, 0.0) for _, sezioni in self._recenti]
+
+    def percentili(self, sezione: str | None = None, ps=(50, 95, 99)) -> Dict[str, float]:
+        valori = sorted(self.tempi(sezione))
+        return {f"p{p}": percentile(valori, p) for p in ps}
+
+    def riepilogo(self) -> Dict[str, Dict[str, float]]:
+        """Percentili del frame e di ogni sezione vista nella finestra (ricalcolato solo dopo un nuovo frame)"""
+        if self._riepilogo is None:
+            nomi = list(SEZIONI) + sorted({n for _, s in self._recenti for n in s} - set(SEZIONI))
+            self._riepilogo = {"frame": self.percentili()}
+            for nome in nomi:
+                if any(nome in s for _, s in self._recenti): self._riepilogo[nome] = self.percentili(nome)
+        return self._riepilogo
+
+    # ---------- ESPORTAZIONE ----------
+    def esporta(self, percorso: str) -> int:
+        """Scrive la traccia (un frame per riga; .json per JSON, altrimenti CSV) e ritorna i frame scritti"""
+        nomi = list(SEZIONI) + sorted({n for _, s in self.traccia for n in s} - set(SEZIONI))
+        if percorso.endswith(".json"):
+            with open(percorso, "w", encoding="utf-8") as f:
+                json.dump({"budget_ms": self.budget_ms,
+                           "frame": [{"totale": round(t, 4), **{n: round(v, 4) for n, v in s.items()}} for t, s in self.traccia]}, f)
+        else:
+            with open(percorso, "w", newline="", encoding="utf-8") as f:
+                scrittore = csv.writer(f)
+                scrittore.writerow(["frame", "totale_ms"] + nomi)
+                for i, (totale, sezioni) in enumerate(self.traccia):
+                    scrittore.writerow([i, f"{totale:.4f}"] + [f"{sezioni.get(n, 0.0):.4f}" for n in nomi])
+        return len(self.traccia)
+
+    # ---------- OVERLAY ----------
+    LARGHEZZA_OVERLAY = 260
+    ALTEZZA_GRAFICO = 60
+
+    def rect_overlay(self, font: pygame.font.Font, pos=(10, 10)) -> pygame.Rect:
+        """Zona occupata dal pannello (serve al renderer per ridisegnarla)"""
+        righe = 1 + len(self.riepilogo())
+        return pygame.Rect(pos[0], pos[1], self.LARGHEZZA_OVERLAY, righe * font.get_linesize() + self.ALTEZZA_GRAFICO + 12)
+
+    def disegna(self, surface: pygame.Surface, font: pygame.font.Font, pos=(10, 10)) -> pygame.Rect:
+        """Pannello con i percentili per sezione e il grafico dei tempi di frame (linea rossa = budget)"""
+        righe = [f"{'':7} {'p50':>6} {'p95':>6} {'p99':>6}"]
+        for nome, p in self.riepilogo().items():
+            righe.append(f"{nome:7} {p['p50']:6.2f} {p['p95']:6.2f} {p['p99']:6.2f}")
+        alt_riga = font.get_linesize()
+        larghezza, alt_grafico = self.LARGHEZZA_OVERLAY, self.ALTEZZA_GRAFICO
+        rect = self.rect_overlay(font, pos)
+        pannello = pygame.Surface(rect.size, pygame.SRCALPHA)
+        pannello.fill((0, 0, 0, 180))
+        for i, riga in enumerate(righe):
+            pannello.blit(font.render(riga, True, (230, 230, 230)), (4, 4 + i * alt_riga))
+
+        # Grafico: una barra per frame, scala fissa a 2 volte il budget
+        base = rect.height - 4
+        scala = alt_grafico / (2 * self.budget_ms)
+        tempi = self.tempi()[-(larghezza - 8):]
+        for x, t in enumerate(tempi):
+            h = min(alt_grafico, int(t * scala))
+            colore = (220, 60, 60) if t > self.budget_ms else (60, 200, 90)
+            pygame.draw.line(pannello, colore, (4 + x, base), (4 + x, base - h))
+        y_budget = base - int(self.budget_ms * scala)
+        pygame.draw.line(pannello, (255, 80, 80), (4, y_budget), (larghezza - 4, y_budget))
+        surface.blit(pannello, rect)
+        return rect
@@ -0,0 +1,149 @@
+import pygame
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+# ==========================================
+# RENDERER A RETTANGOLI "SPORCHI"
+# ==========================================
+
+class DirtyRenderer:
+    """
+    Ridisegna solo le zone dello schermo dove qualcosa è cambiato.
+    Ogni frame i widget visibili vengono registrati con traccia(chiave, rect, stato):
+    se lo stato (o il rettangolo) di un widget è diverso dal frame precedente,
+    la sua zona vecchia e nuova viene ridisegnata e aggiornata con display.update().
+    Un cambio di scena (stato di gioco, livello, dimensione finestra) o invalida()
+    forzano invece un ridisegno completo con display.flip().
+    """
+    def __init__(self):
+        self._precedenti: Dict[Hashable, Tuple[pygame.Rect, Any]] = {}
+        self._correnti: Dict[Hashable, Tuple[pygame.Rect, Any]] = {}
+        self._scena = None
+        self._forza_completo = True
+        self.profiler = None # Se impostato (ProfilerFrame), flip/update vengono misurati come sezione "flip"
+        # Contatori (utili per capire quanto lavoro stiamo risparmiando)
+        self.frame_completi = 0
+        self.frame_parziali = 0
+        self.frame_saltati = 0
+
+    def invalida(self):
+        """Al prossimo frame ridisegna tutto (resize, cambio modalità video, finestra esposta)"""
+        self._forza_completo = True
+
+    def traccia(self, chiave: Hashable, rect: pygame.Rect, stato: Any = None):
+        self._correnti[chiave] = (pygame.Rect(rect), stato)
+
+    def _zone_sporche(self) -> List[pygame.Rect]:
+        zone = []
+        for chiave, (rect, stato) in self._correnti.items():
+            vecchio = self._precedenti.get(chiave)
+            if vecchio is None:
+                zone.append(rect)
+            elif vecchio[0] != rect or vecchio[1] != stato:
+                zone.append(vecchio[0])
+                zone.append(rect)
+        # Widget spariti: va ripulita la zona che occupavano
+        for chiave, (rect, _) in self._precedenti.items():
+            if chiave not in self._correnti:
+                zone.append(rect)
+        return [z for z in zone if z.width > 0 and z.height > 0]
+
+    def presenta(self, scena: Hashable, disegna: Callable[[], None]) -> bool:
+        """
+        Chiude il frame: decide cosa ridisegnare e lo porta a schermo.
+        Ritorna True se qualcosa è stato effettivamente disegnato.
+        """
+        superficie = pygame.display.get_surface()
+        completo = self._forza_completo or scena != self._scena
+        zone = [] if completo else self._zone_sporche()
+
+        self._precedenti, self._correnti = self._correnti, {}
+        self._scena = scena
+        self._forza_completo = False
+
+        porta_a_schermo = self.profiler.sezione("flip") if self.profiler else nullcontext()
+        if completo:
+            disegna()
+            with porta_a_schermo: pygame.display.flip()
+            self.frame_completi += 1
+            return True
+
+        if not zone:
+            self.frame_saltati += 1
+            return False
+
+        # Il clip limita blit e draw alla zona sporca: lo sfondo intero costa solo l'area ritagliata
+        area = zone[0].unionall(zone[1:]).clip(superficie.get_rect())
+        superficie.set_clip(area)
+        try:
+            disegna()
+        finally:
+            superficie.set_clip(None)
+        with porta_a_schermo: pygame.display.update(zone)
+        self.frame_parziali += 1
+        return True
+
+# ==========================================
+# MODALITÀ IDLE (SCENA FERMA)
+# ==========================================
+
+class IdleScheduler:
+    """
+    Quando l'ultimo frame non ha cambiato nulla e non ci sono animazioni,
+    invece di girare a 60 FPS si blocca su pygame.event.wait finché arriva un input
+    (o scade il timeout, es. per far lampeggiare il cursore del nome).
+    """
+    def __init__(self):
+        self._sporco = True
+        self.attese = 0
+
+    def sveglia(self):
+        """Forza almeno un altro frame attivo (es. dopo un cambio di stato fatto a mano)"""
+        self._sporco = True
+
+    def segnala_frame(self, disegnato: bool):
+        self._sporco = disegnato
+
+    def raccogli_eventi(self, animato: bool = False, timeout_ms: int = 0) -> list:
+        """animato=True (gameplay) mantiene il loop a pieno ritmo; timeout_ms=0 attende senza limite"""
+        if animato or self._sporco:
+            return pygame.event.get()
+
+        self.attese += 1
+        primo = pygame.event.wait(timeout_ms)
+        eventi = [] if primo.type == pygame.NOEVENT else [primo]
+        eventi.extend(pygame.event.get())
+        return eventi
+
+# ==========================================
+# RIDIMENSIONAMENTO RITARDATO
+# ==========================================
+
+class RitardoRidimensiona:
+    """
+    Trascinando il bordo della finestra arrivano decine di VIDEORESIZE al secondo:
+    li accumula e restituisce solo l'ultima dimensione, quando non ne arrivano altri
+    da almeno attesa_ms millisecondi.
+    """
+    def __init__(self, attesa_ms: int = 150):
+        self.attesa_ms = attesa_ms
+        self._dimensione = None
+        self._ultimo = 0
+        self.eventi_accorpati = 0
+
+    def segnala(self, w: int, h: int, ora: int):
+        if self._dimensione is not None: self.eventi_accorpati += 1
+        self._dimensione = (w, h)
+        self._ultimo = ora
+
+    def in_attesa(self) -> bool:
+        return self._dimensione is not None
+
+    def ms_mancanti(self, ora: int) -> int:
+        return max(1, self.attesa_ms - (ora - self._ultimo)) if self._dimensione else 0
+
+    def pronta(self, ora: int):
+        """La dimensione definitiva (w, h) quando la finestra si è fermata, altrimenti None"""
+        if self._dimensione is None or ora - self._ultimo < self.attesa_ms: return None
+        dimensione, self._dimensione = self._dimensione, None
+        return dimensione
@@ -0,0 +1,322 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+from typing import Any, Dict, List
+
+from LogicaGioco import Player, Player1Creator, Player2Creator, RegistroSessioni, Sessione, registro_mostri
+from combattimento import Combattimento
+
+# ==========================================
+# 1. STATO COMPATTO E DIFFERENZE
+# ==========================================
+# Protocollo: una riga JSON per messaggio, in entrambe le direzioni.
+# Client -> server: {"tipo": "entra", "sessione": "s1", "giocatore": 1, "nome": "Ada", "scelta": "eroe altruista"}
+#                   {"tipo": "usa", "oggetto": "Pozione"}, {"tipo": "combatti", "mostri": ["goblin"], "seed": 1},
+#                   {"tipo": "livello"}, {"tipo": "esci"}
+# Server -> client: {"tipo": "stato", "v": 0, "stato": {...}} all'ingresso, poi solo {"tipo": "diff", "v": n, "cambi": {...}}
+
+def stato_sessione(sessione: Sessione) -> Dict[str, Any]:
+    manager = sessione.manager
+    return {
+        "livello": manager.livello_corrente,
+        "giocatori": [{"nome": p.nome, "hp": p.hp, "moralita": p.moralita, "inventario": p._inventario.conteggi()}
+                      for p in manager.giocatori],
+    }
+
+def diff_stato(vecchio: Dict[str, Any], nuovo: Dict[str, Any]) -> Dict[str, Any]:
+    """Solo ciò che è cambiato: i giocatori per indice, e di ognuno solo i campi diversi"""
+    cambi: Dict[str, Any] = {}
+    if vecchio.get("livello") != nuovo["livello"]: cambi["livello"] = nuovo["livello"]
+    prima = vecchio.get("giocatori", [])
+    giocatori = {}
+    for i, g in enumerate(nuovo["giocatori"]):
+        precedente = prima[i] if i < len(prima) else {}
+        campi = {k: v for k, v in g.items() if precedente.get(k) != v}
+        if campi: giocatori[str(i)] = campi
+    if giocatori: cambi["giocatori"] = giocatori
+    if len(prima) > len(nuovo["giocatori"]): cambi["n_giocatori"] = len(nuovo["giocatori"])
+    return cambi
+
+def applica_diff(stato: Dict[str, Any], cambi: Dict[str, Any]) -> Dict[str, Any]:
+    """Lato client: ricostruisce lo stato completo a partire dall'ultimo e da una diff"""
+    if "livello" in cambi: stato["livello"] = cambi["livello"]
+    giocatori = stato.setdefault("giocatori", [])
+    if "n_giocatori" in cambi: del giocatori[cambi["n_giocatori"]:]
+    for indice, campi in cambi.get("giocatori", {}).items():
+        i = int(indice)
+        while len(giocatori) <= i: giocatori.append({})
+        giocatori[i].update(campi)
+    return stato
+
+def codifica(messaggio: Dict[str, Any]) -> bytes:
+    return json.dumps(messaggio, separators=(",", ":")).encode("utf-8") + b"\n"
+
+def errore(writer: asyncio.StreamWriter, testo: str) -> None:
+    writer.write(codifica({"tipo": "errore", "messaggio": testo}))
+
+# ==========================================
+# 2. TAVOLO (UNA SESSIONE IN RETE)
+# ==========================================
+
+class Tavolo:
+    """Una sessione del registro con i client collegati e l'ultimo stato inviato"""
+    def __init__(self, sessione: Sessione):
+        self.sessione = sessione
+        self.client: Dict[int, asyncio.StreamWriter] = {} # 1/2 -> connessione del giocatore
+        self.personaggi: Dict[int, Player] = {}           # 1/2 -> personaggio (resta se il client si riconnette)
+        self.ultimo_stato = stato_sessione(sessione)
+        self.versione = 0
+        self.sporco = False
+        self.chiusura: asyncio.TimerHandle | None = None  # Chiusura programmata quando l'ultimo client se ne va
+        # Ogni cambiamento pubblicato dalla logica segna il tavolo: la diff parte una volta sola
+        sessione.manager.bus.iscrivi("*", self._segna)
+
+    def _segna(self, evento) -> None:
+        self.sporco = True
+
+    def stacca(self) -> None:
+        if self.chiusura: self.chiusura.cancel()
+        self.chiusura = None
+        self.sessione.manager.bus.disiscrivi("*", self._segna)
+
+    def invia_a_tutti(self, messaggio: Dict[str, Any]) -> None:
+        dati = codifica(messaggio)
+        for writer in list(self.client.values()):
+            if not writer.is_closing(): writer.write(dati)
+
+    def pubblica_diff(self, forza: bool = False) -> Dict[str, Any] | None:
+        """Consegna gli eventi della sessione e, se qualcosa è cambiato, manda la diff a tutti"""
+        self.sessione.manager.bus.distribuisci()
+        if not (self.sporco or forza): return None
+        self.sporco = False
+        nuovo = stato_sessione(self.sessione)
+        cambi = diff_stato(self.ultimo_stato, nuovo)
+        self.ultimo_stato = nuovo
+        if not cambi: return None
+        self.versione += 1
+        self.invia_a_tutti({"tipo": "diff", "v": self.versione, "cambi": cambi})
+        return cambi
+
+# ==========================================
+# 3. SERVER ASYNCIO
+# ==========================================
+
+class ServerGioco:
+    """
+    Un solo event loop per tutte le sessioni: ogni connessione è una coroutine che legge
+    righe JSON, le applica alla GameFacade della sua sessione e manda a tutti i client del
+    tavolo solo le differenze di stato. Le sessioni vivono in un RegistroSessioni: quando
+    un tavolo resta senza client per `attesa_chiusura` secondi (il tempo per riconnettersi)
+    esce dal server e la sua sessione viene chiusa.
+    """
+    CREATOR = {1: Player1Creator(), 2: Player2Creator()}
+
+    def __init__(self, registro: RegistroSessioni | None = None, host: str = "127.0.0.1", porta: int = 8765,
+                 attesa_chiusura: float = 30.0):
+        self.registro = registro or RegistroSessioni()
+        self.host = host
+        self.porta = porta
+        self.attesa_chiusura = attesa_chiusura
+        self.tavoli: Dict[str, Tavolo] = {}
+        self._server: asyncio.AbstractServer | None = None
+        self.messaggi = 0
+
+    async def avvia(self) -> int:
+        """Apre la porta (0 = una libera) e ritorna quella effettiva"""
+        self._server = await asyncio.start_server(self._gestisci, self.host, self.porta)
+        self.porta = self._server.sockets[0].getsockname()[1]
+        return self.porta
+
+    async def chiudi(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        for tavolo in self.tavoli.values():
+            tavolo.stacca()
+            for writer in tavolo.client.values(): writer.close()
+        self.registro.chiudi_tutte()
+
+    def tavolo(self, id: str) -> Tavolo:
+        tavolo = self.tavoli.get(id)
+        if tavolo is None:
+            sessione = self.registro.get(id) if id in self.registro else self.registro.crea(id)
+            tavolo = self.tavoli[id] = Tavolo(sessione)
+        return tavolo
+
+    def _programma_chiusura(self, tavolo: Tavolo) -> None:
+        if self.attesa_chiusura <= 0:
+            self._chiudi_tavolo(tavolo)
+        else:
+            tavolo.chiusura = asyncio.get_running_loop().call_later(self.attesa_chiusura, self._chiudi_tavolo, tavolo)
+
+    def _chiudi_tavolo(self, tavolo: Tavolo) -> None:
+        """Nessuno è tornato: il tavolo esce dal server e la sessione dal registro (con l'ultimo salvataggio)"""
+        tavolo.chiusura = None
+        id = tavolo.sessione.id
+        if tavolo.client or self.tavoli.get(id) is not tavolo: return
+        del self.tavoli[id]
+        tavolo.stacca()
+        self.registro.chiudi(id)
+
+    # ---------- CONNESSIONI ----------
+    async def _gestisci(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        tavolo, giocatore = None, None
+        try:
+            while True:
+                try:
+                    riga = await reader.readline()
+                except ValueError: # Riga oltre il limite dello stream: il resto della riga viene scartato
+                    errore(writer, "Messaggio troppo lungo")
+                    await writer.drain()
+                    continue
+                if not riga: break
+                try:
+                    messaggio = json.loads(riga)
+                except ValueError:
+                    messaggio = None
+                if not isinstance(messaggio, dict):
+                    errore(writer, "Serve un oggetto JSON per riga")
+                    continue
+                self.messaggi += 1
+                if messaggio.get("tipo") == "esci": break
+                try:
+                    if tavolo is None:
+                        tavolo, giocatore = self._entra(messaggio, writer)
+                    else:
+                        self._azione(tavolo, giocatore, messaggio, writer)
+                except (TypeError, ValueError) as e: # Campi di tipo sbagliato sfuggiti alla validazione
+                    errore(writer, f"Messaggio non valido: {e}")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if tavolo is not None and tavolo.client.get(giocatore) is writer:
+                del tavolo.client[giocatore]
+                if not tavolo.client: self._programma_chiusura(tavolo)
+            writer.close()
+
+    def _entra(self, messaggio: Dict[str, Any], writer: asyncio.StreamWriter):
+        giocatore, sessione = messaggio.get("giocatore"), messaggio.get("sessione")
+        if (messaggio.get("tipo") != "entra" or not isinstance(giocatore, int) or giocatore not in self.CREATOR
+                or not isinstance(sessione, (str, int)) or sessione == ""):
+            errore(writer, "Prima bisogna entrare: tipo, sessione, giocatore (1 o 2)")
+            return None, None
+        nome, scelta = messaggio.get("nome", ""), messaggio.get("scelta")
+        if not isinstance(nome, str) or not (scelta is None or isinstance(scelta, str)):
+            errore(writer, "nome e scelta devono essere testi")
+            return None, None
+        tavolo = self.tavolo(str(sessione))
+        if giocatore in tavolo.client:
+            errore(writer, f"Il giocatore {giocatore} è già collegato")
+            return None, None
+
+        if giocatore not in tavolo.personaggi: # Al primo ingresso il personaggio viene creato
+            tavolo.personaggi[giocatore] = tavolo.sessione.facade.crea_personaggio_completo(
+                self.CREATOR[giocatore], giocatore, nome, scelta)
+        # Gli altri ricevono la diff, chi entra lo stato completo (già aggiornato)
+        tavolo.pubblica_diff()
+        if tavolo.chiusura: # Qualcuno è tornato prima della chiusura
+            tavolo.chiusura.cancel()
+            tavolo.chiusura = None
+        tavolo.client[giocatore] = writer
+        writer.write(codifica({"tipo": "stato", "v": tavolo.versione, "stato": tavolo.ultimo_stato}))
+        return tavolo, giocatore
+
+    def _azione(self, tavolo: Tavolo, giocatore: int, messaggio: Dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        tipo = messaggio.get("tipo")
+        manager = tavolo.sessione.manager
+        if tipo == "usa":
+            oggetto = messaggio.get("oggetto")
+            if not isinstance(oggetto, str) or not tavolo.personaggi[giocatore].usa_item(oggetto):
+                errore(writer, "Oggetto non disponibile")
+        elif tipo == "combatti":
+            ids, seed = messaggio.get("mostri", ["goblin"]), messaggio.get("seed")
+            if not isinstance(ids, list) or not ids or not all(isinstance(id, str) for id in ids):
+                errore(writer, "mostri deve essere una lista di id")
+                return
+            if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+                errore(writer, "seed deve essere un intero")
+                return
+            try:
+                mostri = [registro_mostri.crea_mostro(id) for id in ids]
+            except KeyError as e:
+                errore(writer, f"Mostro sconosciuto: {e}")
+                return
+            esito = Combattimento(manager.giocatori, mostri, seed=seed, bus=manager.bus).risolvi()
+            tavolo.invia_a_tutti({"tipo": "esito", **esito.as_dict()})
+        elif tipo == "livello":
+            manager.livello_corrente += 1
+            tavolo.sporco = True # Il livello non passa dal bus
+        else:
+            errore(writer, f"Azione sconosciuta: {tipo}")
+            return
+        tavolo.pubblica_diff()
+
+# ==========================================
+# 4. CLIENT (TEST E BOT)
+# ==========================================
+
+class ClientGioco:
+    """Client minimale: tiene lo stato ricostruito dalle diff ricevute"""
+    def __init__(self):
+        self.stato: Dict[str, Any] = {}
+        self.versione = -1
+        self.ricevuti: List[Dict[str, Any]] = []
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def connetti(self, host: str, porta: int) -> None:
+        self._reader, self._writer = await asyncio.open_connection(host, porta)
+
+    async def invia(self, messaggio: Dict[str, Any]) -> None:
+        self._writer.write(codifica(messaggio))
+        await self._writer.drain()
+
+    async def ricevi(self, timeout: float = 2.0) -> Dict[str, Any]:
+        riga = await asyncio.wait_for(self._reader.readline(), timeout)
+        if not riga: raise ConnectionError("Connessione chiusa dal server")
+        messaggio = json.loads(riga)
+        self.ricevuti.append(messaggio)
+        if messaggio["tipo"] == "stato":
+            self.stato, self.versione = messaggio["stato"], messaggio["v"]
+        elif messaggio["tipo"] == "diff":
+            applica_diff(self.stato, messaggio["cambi"])
+            self.versione = messaggio["v"]
+        return messaggio
+
+    async def ricevi_fino_a(self, tipo: str, timeout: float = 2.0) -> Dict[str, Any]:
+        while True:
+            messaggio = await self.ricevi(timeout)
+            if messaggio["tipo"] == tipo: return messaggio
+
+    async def chiudi(self) -> None:
+        if self._writer:
+            self._writer.write(codifica({"tipo": "esci"}))
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Server di gioco in rete (una riga JSON per messaggio)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--salvataggi", default=None, help="Cartella dove salvare le sessioni (di default restano in memoria)")
+    parser.add_argument("--attesa-chiusura", type=float, default=30.0, help="Secondi prima di chiudere una sessione rimasta senza client")
+    args = parser.parse_args()
+
+    async def principale():
+        server = ServerGioco(RegistroSessioni(args.salvataggi), args.host, args.porta, args.attesa_chiusura)
+        porta = await server.avvia()
+        print(f"Server in ascolto su {args.host}:{porta}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.chiudi()
+
+    try:
+        asyncio.run(principale())
+    except KeyboardInterrupt:
+        pass
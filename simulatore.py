@@ -0,0 +1,262 @@
+from __future__ import annotations
+import argparse
+import csv
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any
+
+from LogicaGioco import Item, Player1, Player2, registro_mostri, catalogo_oggetti
+from combattimento import Combattimento, DANNO_A_MANI_NUDE, SOGLIA_CURA, DADO_INIZIATIVA
+
+try:
+    import numpy as np
+except ImportError: # Serve solo per il percorso veloce (--veloce)
+    np = None
+
+# ==========================================
+# 1. SCENARI
+# ==========================================
+# Uso: python simulatore.py --partite 100000 --veloce --uscita simulazioni
+
+MOSTRI = registro_mostri.tipi() # Tutti i tipi della tabella dei mostri
+
+INVENTARI = { # Nomi degli oggetti del catalogo
+    "vuoto": [],
+    "spada": ["Spada"],
+    "spada_pozione": ["Spada", "Pozione"],
+}
+
+BLOCCO = 5000          # Combattimenti per task mandato a un processo
+MAX_TURNI = 200
+PASSO_DANNI = 10       # Larghezza delle fasce nella distribuzione dei danni subiti
+
+class Scenario:
+    """Un mostro contro un party di due giocatori con la stessa moralità e lo stesso inventario"""
+    def __init__(self, mostro: str, moralita: int, inventario: str):
+        self.mostro = mostro
+        self.moralita = moralita
+        self.inventario = inventario
+
+    def oggetti(self) -> List[Item]:
+        return [catalogo_oggetti.per_nome(nome) for nome in INVENTARI[self.inventario]]
+
+    def crea_party(self) -> list:
+        party = [Player1("P1", self.moralita), Player2("P2", self.moralita)]
+        for p in party:
+            for item in self.oggetti():
+                p._inventario.add_item(item)
+        return party
+
+    def __repr__(self):
+        return f"{self.mostro}/m{self.moralita}/{self.inventario}"
+
+def nuovo_aggregato() -> Dict[str, Any]:
+    return {"partite": 0, "vittorie": 0, "sconfitte": 0, "pareggi": 0,
+            "turni": Counter(), "turni_vittoria": Counter(), "danni": Counter()}
+
+def unisci(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    for chiave in ("partite", "vittorie", "sconfitte", "pareggi"):
+        a[chiave] += b[chiave]
+    for chiave in ("turni", "turni_vittoria", "danni"):
+        a[chiave].update(b[chiave])
+    return a
+
+# ==========================================
+# 2. PERCORSO ESATTO (motore di combattimento vero)
+# ==========================================
+
+def simula_esatto(scenario: Scenario, n: int, seed: int, max_turni: int = MAX_TURNI) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    tipo = registro_mostri.get(scenario.mostro)
+    agg = nuovo_aggregato()
+    for _ in range(n):
+        esito = Combattimento(scenario.crea_party(), [registro_mostri.crea_mostro(tipo.id)], rng=rng, max_turni=max_turni).risolvi()
+        agg["partite"] += 1
+        if esito.vincitore == "giocatori":
+            agg["vittorie"] += 1
+            agg["turni_vittoria"][esito.turni] += 1
+        elif esito.vincitore == "mostri": agg["sconfitte"] += 1
+        else: agg["pareggi"] += 1
+        agg["turni"][esito.turni] += 1
+        agg["danni"][esito.danni_subiti // PASSO_DANNI * PASSO_DANNI] += 1
+    return agg
+
+# ==========================================
+# 3. PERCORSO VELOCE (NumPy, un array di combattimenti)
+# ==========================================
+
+def simula_numpy(scenario: Scenario, n: int, seed: int, max_turni: int = MAX_TURNI) -> Dict[str, Any]:
+    """
+    Stesse regole di Combattimento (un mostro contro due giocatori) applicate a n scontri
+    in parallelo: ogni turno è un passo vettoriale. Le statistiche coincidono con il percorso
+    esatto, i singoli combattimenti no (i numeri casuali sono estratti in un altro ordine).
+    """
+    rng = np.random.default_rng(seed)
+    mostro = registro_mostri.get(scenario.mostro)
+    oggetti = scenario.oggetti()
+    armi = [item.valore for item in oggetti if item.tipo == "Attacco"]
+    danno_p = max(armi) if armi else DANNO_A_MANI_NUDE
+    cure_iniziali = [item.valore for item in oggetti if item.tipo == "Cura"]
+    valore_cura = cure_iniziali[0] if cure_iniziali else 0
+    utility = sum(1 for item in oggetti if item.tipo == "Utility")
+
+    hp = np.full((n, 2), 100, dtype=np.int64)
+    hp_m = np.full(n, mostro.hp, dtype=np.int64)
+    cure = np.full((n, 2), len(cure_iniziali), dtype=np.int64)
+    danni_subiti = np.zeros(n, dtype=np.int64)
+    turni = np.zeros(n, dtype=np.int64)
+    attivi = np.ones(n, dtype=bool)
+    righe = np.arange(n)
+
+    # Ordine di turno come in Combattimento: iniziativa, poi giocatori prima dei mostri, poi ordine di lista
+    bonus = np.array([scenario.moralita // 2 + 2 * utility] * 2 + [(mostro.furtivita + mostro.intelligenza) // 2])
+    spareggio = np.array([1 * 4 + 2, 1 * 4 + 1, 0])
+
+    for t in range(1, max_turni + 1):
+        if not attivi.any(): break
+        turni[attivi] = t
+        chiave = (rng.integers(1, DADO_INIZIATIVA + 1, size=(n, 3)) + bonus) * 8 + spareggio
+        ordine = np.argsort(-chiave, axis=1)
+        for r in range(3):
+            attore = ordine[:, r]
+            vivi = hp > 0
+            in_corso = attivi & (hp_m > 0) & vivi.any(axis=1)
+            for j in (0, 1):
+                agisce = in_corso & (attore == j) & vivi[:, j]
+                cura = agisce & (cure[:, j] > 0) & (hp[:, j] <= 100 * SOGLIA_CURA)
+                hp[cura, j] = np.minimum(hp[cura, j] + valore_cura, 100)
+                cure[cura, j] -= 1
+                colpo = agisce & ~cura
+                hp_m[colpo] = np.maximum(hp_m[colpo] - danno_p, 0)
+            agisce = in_corso & (attore == 2)
+            entrambi = vivi[:, 0] & vivi[:, 1]
+            if mostro.intelligenza >= 5:
+                scelto = np.where(hp[:, 1] < hp[:, 0], 1, 0) # A parità di HP il primo della lista
+            else:
+                scelto = rng.integers(0, 2, size=n)
+            bersaglio = np.where(entrambi, scelto, np.where(vivi[:, 0], 0, 1))
+            colpiti = righe[agisce]
+            b = bersaglio[agisce]
+            inflitto = np.minimum(mostro.danno, hp[colpiti, b])
+            hp[colpiti, b] -= inflitto
+            danni_subiti[colpiti] += inflitto
+        attivi &= (hp_m > 0) & (hp > 0).any(axis=1)
+
+    vittoria = hp_m <= 0
+    sconfitta = ~vittoria & ~(hp > 0).any(axis=1)
+    agg = nuovo_aggregato()
+    agg["partite"] = n
+    agg["vittorie"] = int(vittoria.sum())
+    agg["sconfitte"] = int(sconfitta.sum())
+    agg["pareggi"] = n - agg["vittorie"] - agg["sconfitte"]
+    agg["turni"] = Counter(dict(zip(*(v.tolist() for v in np.unique(turni, return_counts=True)))))
+    agg["turni_vittoria"] = Counter(dict(zip(*(v.tolist() for v in np.unique(turni[vittoria], return_counts=True)))))
+    agg["danni"] = Counter(dict(zip(*(v.tolist() for v in np.unique(danni_subiti // PASSO_DANNI * PASSO_DANNI, return_counts=True)))))
+    return agg
+
+# ==========================================
+# 4. ESECUZIONE IN PARALLELO
+# ==========================================
+
+def _esegui_blocco(argomenti):
+    scenario, n, seed, veloce, max_turni = argomenti
+    return (simula_numpy if veloce else simula_esatto)(scenario, n, seed, max_turni)
+
+def simula(scenari: List[Scenario], partite: int, seed: int = 0, veloce: bool = False,
+           processi: int | None = None, max_turni: int = MAX_TURNI) -> Dict[str, Dict[str, Any]]:
+    """Divide ogni scenario in blocchi, li distribuisce sui processi e unisce i risultati"""
+    if veloce and np is None: raise RuntimeError("Il percorso veloce richiede numpy (pip install numpy)")
+    blocco = BLOCCO * 20 if veloce else BLOCCO
+    lavori, chiavi = [], []
+    for i, scenario in enumerate(scenari):
+        for k, inizio in enumerate(range(0, partite, blocco)):
+            seme = (seed * 1_000_003 + i) * 10_007 + k # Ogni blocco ha il suo seed: risultati ripetibili
+            lavori.append((scenario, min(blocco, partite - inizio), seme, veloce, max_turni))
+            chiavi.append(repr(scenario))
+
+    risultati = {repr(s): nuovo_aggregato() for s in scenari}
+    if processi == 1:
+        esiti = map(_esegui_blocco, lavori)
+        for chiave, agg in zip(chiavi, esiti): unisci(risultati[chiave], agg)
+    else:
+        with ProcessPoolExecutor(processi) as pool:
+            for chiave, agg in zip(chiavi, pool.map(_esegui_blocco, lavori)): unisci(risultati[chiave], agg)
+    return risultati
+
+# ==========================================
+# 5. STATISTICHE E CSV
+# ==========================================
+
+def percentile(conteggi: Counter, q: float) -> int:
+    totale = sum(conteggi.values())
+    if not totale: return 0
+    cumulato = 0
+    for valore in sorted(conteggi):
+        cumulato += conteggi[valore]
+        if cumulato >= q * totale: return valore
+    return max(conteggi)
+
+def curva_sopravvivenza(agg: Dict[str, Any]) -> List[tuple]:
+    """(turno, probabilità che il mostro sia ancora vivo dopo quel turno)"""
+    curva, uccisi = [], 0
+    for t in range(1, max(agg["turni"], default=0) + 1):
+        uccisi += agg["turni_vittoria"].get(t, 0)
+        curva.append((t, 1 - uccisi / agg["partite"]))
+    return curva
+
+def scrivi_csv(scenari: List[Scenario], risultati: Dict[str, Dict[str, Any]], cartella: str) -> None:
+    os.makedirs(cartella, exist_ok=True)
+    with open(os.path.join(cartella, "riepilogo.csv"), "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["mostro", "moralita", "inventario", "partite", "vittorie", "sconfitte", "pareggi",
+                    "tasso_vittoria", "turni_medi", "ttk_p50", "ttk_p90", "danni_subiti_medi"])
+        for s in scenari:
+            agg = risultati[repr(s)]
+            n = agg["partite"]
+            turni_medi = sum(t * c for t, c in agg["turni"].items()) / n
+            danni_medi = sum(d * c for d, c in agg["danni"].items()) / n # Approssimato per fasce
+            w.writerow([s.mostro, s.moralita, s.inventario, n, agg["vittorie"], agg["sconfitte"], agg["pareggi"],
+                        round(agg["vittorie"] / n, 4), round(turni_medi, 2),
+                        percentile(agg["turni_vittoria"], 0.5), percentile(agg["turni_vittoria"], 0.9), round(danni_medi, 1)])
+
+    with open(os.path.join(cartella, "sopravvivenza.csv"), "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["mostro", "moralita", "inventario", "turno", "prob_mostro_vivo"])
+        for s in scenari:
+            for t, p in curva_sopravvivenza(risultati[repr(s)]):
+                w.writerow([s.mostro, s.moralita, s.inventario, t, round(p, 5)])
+
+    with open(os.path.join(cartella, "danni.csv"), "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["mostro", "moralita", "inventario", "danni_da", "danni_a", "partite"])
+        for s in scenari:
+            for d, c in sorted(risultati[repr(s)]["danni"].items()):
+                w.writerow([s.mostro, s.moralita, s.inventario, d, d + PASSO_DANNI - 1, c])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulatore Monte Carlo per il bilanciamento dei mostri")
+    parser.add_argument("--partite", type=int, default=10000, help="Combattimenti per scenario")
+    parser.add_argument("--mostri", nargs="+", default=MOSTRI, choices=MOSTRI)
+    parser.add_argument("--moralita", nargs="+", type=int, default=[3, 5, 8])
+    parser.add_argument("--inventari", nargs="+", default=list(INVENTARI), choices=list(INVENTARI))
+    parser.add_argument("--veloce", action="store_true", help="Percorso vettoriale con NumPy")
+    parser.add_argument("--processi", type=int, default=None, help="Processi in parallelo (default: tutti i core)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turni", type=int, default=MAX_TURNI)
+    parser.add_argument("--uscita", default="simulazioni", help="Cartella dei CSV")
+    args = parser.parse_args()
+
+    scenari = [Scenario(m, mor, inv) for m in args.mostri for mor in args.moralita for inv in args.inventari]
+    inizio = time.perf_counter()
+    risultati = simula(scenari, args.partite, args.seed, args.veloce, args.processi, args.max_turni)
+    durata = time.perf_counter() - inizio
+    scrivi_csv(scenari, risultati, args.uscita)
+
+    totale = len(scenari) * args.partite
+    print(f"{totale} combattimenti in {durata:.2f}s ({totale / durata:,.0f}/s) -> {args.uscita}/")
+    for s in scenari:
+        agg = risultati[repr(s)]
+        print(f"  {s!r:32} vittorie {agg['vittorie'] / agg['partite']:6.1%}  ttk p50 {percentile(agg['turni_vittoria'], 0.5)}")
@@ -0,0 +1,157 @@
+import pygame
+from LogicaGioco import Observer, Subject
+from cache_font import get_font, render_testo
+
+# ==========================================
+# WIDGET DELL'HUD (STRATI PRE-DISEGNATI)
+# ==========================================
+# Ogni widget si compone in una superficie propria e negli altri frame è un solo blit.
+# render_testo è un attributo del modulo: la GUI lo sostituisce con la versione misurata dal profiler.
+
+class InventoryUI:
+    """
+    Box dell'inventario di un giocatore. Viene composto in una superficie propria, ricomposta
+    solo quando cambiano l'inventario o la categoria attiva: negli altri frame è un solo blit.
+    """
+    def __init__(self, x, y, player):
+        self.x = x
+        self.y = y
+        self.player = player
+        self.slot_size = 35 #dimensioni di ogni slot dell'inventario
+        self.padding = 5 #spazio tra uno slot e l'altro
+        self.font = get_font("Arial", 11, bold=True)
+        self.font_cat = get_font("Arial", 9, bold=True)
+        # Definiamo le categorie fisse
+        self.categorie = ["Attacco", "Cura", "Utility"]
+        self._maiuscole = {} # nome -> NOME, calcolato una volta sola per oggetto
+        self._strato = None        # Superficie già composta
+        self._firma_strato = None  # firma() con cui è stata composta
+
+    def _maiuscolo(self, nome):
+        testo = self._maiuscole.get(nome)
+        if testo is None:
+            testo = self._maiuscole[nome] = nome.upper()
+        return testo
+
+    def get_rect(self, categoria_attiva):
+        """Area occupata dal box, allargata se gli slot della categoria escono dal bordo"""
+        n = len(self.player._inventario.pile(categoria_attiva))
+        larghezza = max(150, 5 + n * (self.slot_size + self.padding))
+        return pygame.Rect(self.x - 5, self.y - 25, larghezza, 70)
+
+    def firma(self, categoria_attiva):
+        # La versione cambia a ogni aggiunta/rimozione: niente da scorrere per capire se ridisegnare
+        # (l'inventario stesso serve per quando viene sostituito, es. restore_state)
+        inventario = self.player._inventario
+        return (categoria_attiva, inventario, inventario.versione)
+
+    def strato(self, categoria_attiva):
+        """La superficie del box, ricomposta solo se la firma è cambiata"""
+        firma = self.firma(categoria_attiva)
+        if self._strato is None or firma != self._firma_strato:
+            self._strato = self._componi(categoria_attiva)
+            self._firma_strato = firma
+        return self._strato
+
+    def disegna(self, surface, categoria_attiva):
+        surface.blit(self.strato(categoria_attiva), (self.x - 5, self.y - 25))
+
+    def _componi(self, categoria_attiva):
+        # Coordinate relative allo strato: (x, y) del box finiscono in (5, 25)
+        strato = pygame.Surface(self.get_rect(categoria_attiva).size, pygame.SRCALPHA)
+        x, y = 5, 25
+
+        # 1. Disegna lo sfondo del rettangolo inventario
+        rect_bg = pygame.Rect(0, 0, 150, 70) # Un box che contiene tutto
+        pygame.draw.rect(strato, (30, 30, 30), rect_bg, border_radius=5)
+        pygame.draw.rect(strato, (200, 200, 200), rect_bg, width=1, border_radius=5)
+
+        # 2. Disegna le scritte delle 3 categorie in alto
+        for i, cat in enumerate(self.categorie):
+            # Se la categoria è quella selezionata, usa il Giallo Oro, altrimenti Grigio
+            colore = (255, 215, 0) if cat == categoria_attiva else (150, 150, 150)
+            txt_cat = render_testo(self.font_cat, cat.upper(), colore)
+            strato.blit(txt_cat, (x + (i * 45), y - 20))
+
+        # 3. Disegna le pile della categoria (già filtrate dall'indice dell'inventario)
+        current_x = x
+        for item, quantita in self.player._inventario.pile(categoria_attiva):
+            rect_slot = pygame.Rect(current_x, y, self.slot_size, self.slot_size)
+            pygame.draw.rect(strato, (50, 50, 50), rect_slot, border_radius=3)
+            pygame.draw.rect(strato, (255, 215, 0), rect_slot, width=1, border_radius=3)
+            # Bordo dorato per lo slot
+
+            # Nome oggetto 
+            txt = render_testo(self.font, self._maiuscolo(item.nome), (255, 255, 255))
+            strato.blit(txt, (rect_slot.centerx - txt.get_width()//2, 
+                              rect_slot.centery - txt.get_height()//2))
+            if quantita > 1: # Quantità della pila nell'angolo in basso a destra
+                txt_q = render_testo(self.font_cat, f"x{quantita}", (255, 215, 0))
+                strato.blit(txt_q, (rect_slot.right - txt_q.get_width() - 2, rect_slot.bottom - txt_q.get_height()))
+
+            current_x += self.slot_size + self.padding
+        return strato
+
+class HealthBar(Observer):
+    """
+    Observer che visualizza la barra della vita (HUD).
+    Simile all'immagine: Barra verde su sfondo scuro, con testo numerico.
+    La barra è composta in una superficie propria: update() la segna da ricomporre,
+    altrimenti ogni frame è un solo blit.
+    """
+    def __init__(self, x, y, w, h, player):
+        self.rect = pygame.Rect(x, y, w, h)
+        self.player = player
+        self.font = get_font("Arial", 16, bold=True)
+        self._strato = None
+        self._firma_strato = None
+        self._sporco = True
+        # Si registra come osservatore del player (riferimento debole: se l'HUD la scarta, sparisce)
+        self.player.attach(self, priorita=10, campi=("hp",))
+
+    def update(self, subject: Subject) -> None:
+        self._sporco = True
+
+    def stacca(self):
+        self.player.detach(self)
+
+    def firma(self):
+        return (self.player.hp, self.player.max_hp)
+
+    def strato(self):
+        """La superficie della barra, ricomposta dopo una notifica o se hp/dimensioni sono cambiati senza notifica"""
+        firma = (self.firma(), self.rect.size)
+        if self._sporco or firma != self._firma_strato:
+            self._strato = self._componi()
+            self._firma_strato = firma
+            self._sporco = False
+        return self._strato
+
+    def disegna(self, surface):
+        surface.blit(self.strato(), self.rect)
+
+    def _componi(self):
+        strato = pygame.Surface(self.rect.size)
+        rect = strato.get_rect()
+        # Sfondo Barra
+        pygame.draw.rect(strato, (50, 50, 50), rect)
+        pygame.draw.rect(strato, (100, 0, 0), rect, width=2) # Bordo rosso scuro
+
+        # Barra Verde
+        if self.player.max_hp > 0:
+            ratio = self.player.hp / self.player.max_hp
+        else:
+            ratio = 0
+        
+        # Evitiamo valori negativi per la larghezza
+        if ratio < 0: ratio = 0
+        
+        current_width = rect.width * ratio
+        rect_hp = pygame.Rect(0, 0, int(current_width), rect.height)
+        pygame.draw.rect(strato, (0, 180, 0), rect_hp) 
+        
+        # Testo
+        txt = f"{self.player.hp} / {self.player.max_hp}"
+        txt_surf = render_testo(self.font, txt, (255, 255, 255))
+        strato.blit(txt_surf, (rect.centerx - txt_surf.get_width()//2, rect.centery - txt_surf.get_height()//2))
+        return strato